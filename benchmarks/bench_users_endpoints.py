@@ -0,0 +1,115 @@
+# benchmarks/bench_users_endpoints.py
+"""
+Microbenchmark for response serialization on the users endpoints.
+
+    python -m benchmarks.bench_users_endpoints [--requests 2000]
+
+1. Serialization only: the stdlib JSONResponse (with jsonable_encoder for
+   ObjectId/datetime) against FastJSONResponse, on typical payloads.
+2. In-process requests against /api/v1/users/login and /token/refresh, with
+   response-model validation on and off. The service layer is replaced by a
+   stub returning canned results, so no MongoDB, bcrypt or JWT work is
+   measured - only routing, validation and serialization.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from bson import ObjectId
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from src.app import app
+from src.configs.config import CurrentConfig
+from src.core import json_response
+from src.core.container import ServiceContainer
+from src.core.json_response import FastJSONResponse
+from src.core.success_response_handler import SuccessResponseHandler
+from src.dbs.init_mongodb import Database
+from src.services.user_service import UserService
+
+TOKEN = "eyJhbGciOiJSUzI1NiIsImtpZCI6ImFiYyIsInR5cCI6IkpXVCJ9." + "x" * 300 + "." + "y" * 340
+
+PAYLOADS = {
+    "login": SuccessResponseHandler.user_authenticated(TOKEN, TOKEN, "customer"),
+    "refresh": SuccessResponseHandler.renewed_access_token(TOKEN, TOKEN, "customer"),
+    "user_list": [
+        {
+            "_id": ObjectId(),
+            "email": f"user{i}@example.com",
+            "first_name": "First",
+            "last_name": "Last",
+            "role": "customer",
+            "created_at": datetime.now(),
+            "updated_at": datetime.now(),
+        }
+        for i in range(100)
+    ],
+}
+
+
+class StubUserService(UserService):
+    """Returns canned results so only the HTTP layer is measured."""
+
+    async def login(self, email, password):
+        return PAYLOADS["login"]
+
+    async def renew_access_token(self, refresh_token):
+        return dict(PAYLOADS["refresh"])
+
+
+def bench_serialization(iterations: int = 20000):
+    print(f"Serialization ({'orjson' if json_response.orjson else 'stdlib json'} backend), "
+          f"{iterations} iterations per payload")
+    for name, payload in PAYLOADS.items():
+        rounds = iterations if name != "user_list" else iterations // 50
+        started = time.perf_counter()
+        for _ in range(rounds):
+            JSONResponse(content=jsonable_encoder(payload, custom_encoder={ObjectId: str}))
+        baseline = (time.perf_counter() - started) / rounds
+        started = time.perf_counter()
+        for _ in range(rounds):
+            FastJSONResponse(content=payload)
+        fast = (time.perf_counter() - started) / rounds
+        print(f"  {name:<10} JSONResponse {baseline * 1e6:9.1f} us   "
+              f"FastJSONResponse {fast * 1e6:9.1f} us   x{baseline / fast:.1f}")
+
+
+async def bench_endpoints(requests: int):
+    container = ServiceContainer(Database())
+    container.user_service = StubUserService(container.user_db_manager, container.key_db_manager)
+    container.access_controller.user_service = container.user_service
+    app.state.container = container
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\nEndpoints, {requests} sequential in-process requests each")
+        for validation in (True, False):
+            CurrentConfig.RESPONSE_MODEL_VALIDATION = validation
+            for name, call in (
+                ("login", lambda: client.post("/api/v1/users/login",
+                                              data={"username": "a@example.com", "password": "x"})),
+                ("refresh", lambda: client.post("/api/v1/users/token/refresh",
+                                                json={"refresh_token": TOKEN})),
+            ):
+                for _ in range(50):  # warm-up
+                    await call()
+                started = time.perf_counter()
+                for _ in range(requests):
+                    response = await call()
+                elapsed = time.perf_counter() - started
+                assert response.status_code == 200, response.text
+                print(f"  {name:<8} validation={'on ' if validation else 'off'} "
+                      f"{elapsed / requests * 1e6:8.1f} us/request   {requests / elapsed:8.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    bench_serialization()
+    asyncio.run(bench_endpoints(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,160 @@
 # server.py
+"""
+Application launcher.
+
+    python server.py --reload            # development: single process, auto-reload
+    python server.py --workers 8         # production: pre-forked workers
+
+In production mode the application, its configuration and the JWT keys are
+loaded once in the supervisor and inherited by the forked workers. Each worker
+binds its own SO_REUSEPORT socket so the kernel spreads connections across
+them (platforms without SO_REUSEPORT share one inherited socket instead).
+Workers are numbered through the WORKER_ID environment variable; worker 0
+runs the process-wide background jobs (resource monitor, log cleanup, index
+bootstrap). Dead workers are restarted with the same id.
+
+Metrics are kept per worker. With SERVER_WORKER_PORT_BASE set, worker N also
+listens on SERVER_WORKER_HOST:SERVER_WORKER_PORT_BASE+N, so Prometheus can
+scrape /metrics from every worker rather than whichever accepts the request.
+"""
+import argparse
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
 import uvicorn
+from src.configs.config import CurrentConfig
+from src.helpers.log_config import stop_log_listener
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Run the shopDEV API server.")
+    parser.add_argument("--host", default=CurrentConfig.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=CurrentConfig.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=CurrentConfig.SERVER_WORKERS)
+    parser.add_argument("--reload", action="store_true", help="Development mode with auto-reload.")
+    return parser.parse_args()
+
+
+def _event_loop_options() -> dict:
+    """Prefers uvloop and httptools when they are installed."""
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+    }
+
+
+def _bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(CurrentConfig.SERVER_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerSupervisor:
+    """
+    Forks and supervises the uvicorn worker processes.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        # Without SO_REUSEPORT every worker accepts on one socket bound here
+        self.shared_socket = None if self.reuse_port else _bind_socket(host, port, reuse_port=False)
+        self.children = {}  # pid -> worker id
+        self.stopping = False
+
+    def _run_worker(self, worker_id: int):
+        os.environ["WORKER_ID"] = str(worker_id)
+        sockets = [self.shared_socket or _bind_socket(self.host, self.port, reuse_port=True)]
+        if CurrentConfig.SERVER_WORKER_PORT_BASE:
+            # A port of its own so that this worker's /metrics can be scraped directly
+            sockets.append(_bind_socket(CurrentConfig.SERVER_WORKER_HOST,
+                                        CurrentConfig.SERVER_WORKER_PORT_BASE + worker_id, reuse_port=False))
+        config = uvicorn.Config(
+            self.app,
+            lifespan="on",
+            access_log=False,  # RequestLoggingMiddleware writes the access log
+            log_level=CurrentConfig.LOG_LEVEL.lower(),
+            timeout_keep_alive=CurrentConfig.SERVER_KEEP_ALIVE_SECONDS,
+            **_event_loop_options(),
+        )
+        uvicorn.Server(config).run(sockets=sockets)
+
+    def _spawn(self, worker_id: int):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                self._run_worker(worker_id)
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                # os._exit skips atexit handlers; write out the worker's queued log records first
+                stop_log_listener()
+                os._exit(exit_code)
+        self.children[pid] = worker_id
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        print(f"Started {self.workers} workers on {self.host}:{self.port} "
+              f"({'SO_REUSEPORT' if self.reuse_port else 'shared socket'}, "
+              f"{_event_loop_options()['loop']}/{_event_loop_options()['http']})")
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            worker_id = self.children.pop(pid, None)
+            if worker_id is None or self.stopping:
+                continue
+            print(f"Worker {worker_id} (pid {pid}) exited with status {status}; restarting")
+            time.sleep(1)  # Avoid a tight restart loop if workers crash on startup
+            self._spawn(worker_id)
+
+
+def main():
+    args = _parse_args()
+    if args.reload:
+        uvicorn.run("src.app:app", host=args.host, port=args.port, reload=True)
+        return
+
+    # Import the application and parse the JWT keys once, before forking
+    from src.app import app
+    from src.utils.key_ring import key_ring
+    key_ring.load()
+
+    WorkerSupervisor(app, args.host, args.port, args.workers).run()
+    sys.exit(0)
+
 
 if __name__ == "__main__":
-    uvicorn.run("src.app:app", host="0.0.0.0", port=3055, reload=True)
+    main()
@@ -1,20 +1,29 @@
 # src/app.py
 
 from fastapi import FastAPI, Request, Depends
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from brotli_asgi import BrotliMiddleware
 import asyncio
 from src.dbs.init_mongodb import Database, start_monitoring
-from src.helpers.log_config import setup_logger, log_requests, scheduled_cleanup
+from src.core.container import ServiceContainer
+from src.core.json_response import FastJSONResponse
+from src.dbs.index_registry import index_registry
+from src.dbs import item_db_manager, key_db_manager, user_db_manager  # noqa: F401 - registers declared indexes
+from src.helpers.log_config import setup_logger, RequestLoggingMiddleware, scheduled_cleanup
+from src.helpers.check_connect import loop_lag_probe
+from src.helpers.compression import CompressionMiddleware
 from src.routers.api_v1_router import api_v1_router
+from src.routers.internal.monitoring_router import monitoring_router, metrics_router
+from src.configs.config import CurrentConfig
 from src.auth.authentication_middleware import JWTAuthentication, verify_api_key
+from src.utils.security import password_hashing_pool
+from src.utils.key_ring import key_ring
 from contextlib import asynccontextmanager
 import os
 
 app = FastAPI( title='Python-Dev API', 
                description='A sample FastAPI application.', 
                version='1.0.0',
+               default_response_class=FastJSONResponse,
             #    dependencies=[Depends(verify_api_key)],
             )
 
@@ -39,21 +48,31 @@ def configure_middlewares(application: FastAPI):
         allow_methods=["*"],
         allow_headers=["*"]
     )
-    application.add_middleware(BrotliMiddleware)
 
 def configure_logging_middleware(application: FastAPI):
     """Add logging middleware to the application."""
-    application.middleware("http")(log_requests)
+    application.add_middleware(RequestLoggingMiddleware)
+
+def configure_compression_middleware(application: FastAPI):
+    """
+    Add response compression outside the logging middleware, so access logs
+    and body snippets see the uncompressed response.
+    """
+    application.add_middleware(CompressionMiddleware)
 
 def include_routers(application: FastAPI):
     """Include application routers."""
     application.include_router(api_v1_router, prefix="/api/v1")
+    # Process, GC and MongoDB pool internals are only served to API-key holders
+    application.include_router(monitoring_router, prefix="/internal", dependencies=[Depends(verify_api_key)])
+    if CurrentConfig.METRICS_ENABLED:
+        application.include_router(metrics_router, dependencies=[Depends(verify_api_key)])
 
 # @app.on_event("startup")
 # async def startup_event():
 #     """Application startup: connect to the database, start background tasks."""
 #     await db_instance.connect()
-#     asyncio.create_task(start_monitoring())
+#     asyncio.create_task(start_monitoring(db_instance))
 #     logs_dir = 'logs'  # Ensure this directory exists or is created
 #     asyncio.create_task(scheduled_cleanup(logs_dir, 30))  # Cleanup interval as needed
 
@@ -62,20 +81,50 @@ def include_routers(application: FastAPI):
 #     """Application shutdown: disconnect from the database."""
 #     await db_instance.disconnect()
 
+def is_primary_worker() -> bool:
+    """
+    Whether this process runs the process-wide background jobs. server.py numbers
+    its workers through WORKER_ID; a single process without one is the primary.
+    """
+    return os.getenv("WORKER_ID", "0") == "0"
+
+def holds_search_index() -> bool:
+    """
+    Whether this process builds the in-process search index: its WORKER_ID is
+    listed in SEARCH_INDEX_WORKERS (or that is "all").
+    """
+    workers = {worker.strip() for worker in CurrentConfig.SEARCH_INDEX_WORKERS.split(",")}
+    return "all" in workers or os.getenv("WORKER_ID", "0") in workers
+
 @asynccontextmanager
 async def app_lifespan(app):
     # Application startup logic
+    key_ring.load()  # Parse JWT keys once (no-op if preloaded); key_ring.watch() picks up rotated keys
     await db_instance.connect()
-    asyncio.create_task(start_monitoring())
-    logs_dir = 'logs'
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-    asyncio.create_task(scheduled_cleanup(logs_dir, 30))
+    await db_instance.warm_up()
+    app.state.container = ServiceContainer(db_instance)  # Shared managers, services and controllers
+    await app.state.container.start()
+    asyncio.create_task(key_ring.watch())  # Every worker holds its own key ring
+    asyncio.create_task(loop_lag_probe.run())  # Lag is per event loop, so every worker measures its own
+    if CurrentConfig.SEARCH_INDEX_ENABLED and holds_search_index():
+        asyncio.create_task(app.state.container.search_service.run())  # The other workers search through MongoDB
+    if is_primary_worker():
+        if CurrentConfig.MONGO_ENSURE_INDEXES:
+            try:
+                await index_registry.apply(await db_instance.get_db())
+            except Exception as e:
+                logger.error(f"Index bootstrap failed: {e}")
+        asyncio.create_task(start_monitoring(db_instance))
+        logs_dir = 'logs'
+        if not os.path.exists(logs_dir):
+            os.makedirs(logs_dir)
+        asyncio.create_task(scheduled_cleanup(logs_dir, 30))
 
     yield  # Yield control back to FastAPI until shutdown
 
     # Application shutdown logic
     await db_instance.disconnect()
+    password_hashing_pool.shutdown(wait=False)
 
 # Assign the lifespan context manager to the FastAPI app
 app.router.lifespan_context = app_lifespan
@@ -84,7 +133,7 @@ app.router.lifespan_context = app_lifespan
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle global exceptions."""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={"message": "An unexpected error occurred."}
     )
@@ -92,4 +141,5 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Apply configuration functions
 configure_middlewares(app)
 configure_logging_middleware(app)
+configure_compression_middleware(app)
 include_routers(app)
@@ -1,26 +1,30 @@
 # src/auth/authentication_middleware.py
 
-from fastapi import FastAPI, HTTPException, Depends, Security, status
+from fastapi import FastAPI, HTTPException, Depends, Request, Security, status
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from jose import jwt, JWTError
-from src.utils.security import decode_token
+from src.utils.security import decode_token_cached
+from src.utils.key_ring import key_ring
 from src.dbs.key_db_manager import KeyDBManager
+from src.core.container import get_container
 from src.core.auth_error_response_handler import AuthErrorResponseHandler
 
 class JWTAuthentication:
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
 
     @staticmethod
-    async def get_key_db_manager():
-        """Dependency injection for KeyDBManager."""
-        return KeyDBManager()
+    def get_key_db_manager(request: Request) -> KeyDBManager:
+        """Dependency injection for the shared KeyDBManager."""
+        return get_container(request).key_db_manager
 
     @classmethod
-    async def authenticate_token(cls, token: str = Depends(oauth2_scheme)):
+    async def authenticate_token(cls, request: Request, token: str = Depends(oauth2_scheme)):
         """
         Middleware to authenticate JWT tokens and API keys in FastAPI.
         
         Args:
+            request (Request): The incoming request; the authenticated user_id is
+                recorded on `request.state` for the access log.
             token (str): The JWT token extracted by FastAPI's OAuth2PasswordBearer.
             api_key (str): The API key extracted from the request header.
         """
@@ -28,20 +32,22 @@ class JWTAuthentication:
         if token is None:
             AuthErrorResponseHandler.missing_authorization_header()
         try:
-            payload = await decode_token(token)
+            payload = await decode_token_cached(token)
         except JWTError:
             AuthErrorResponseHandler.credentials_validation_failed()
 
         user_id = payload.get("sub")
         if not user_id:
             AuthErrorResponseHandler.user_id_extraction_failed()
+        request.state.user_id = user_id
 
-        key_db_manager = await cls.get_key_db_manager()
+        key_db_manager = cls.get_key_db_manager(request)
         key_info = await key_db_manager.find_key_information(user_id)
         if key_info is None:
             AuthErrorResponseHandler.key_information_not_found()
 
-        return {"user_id": user_id, "refresh_token": key_info.get('refresh_token')}
+        kid = key_info.get('kid')
+        return {"user_id": user_id, "kid": key_ring.resolve_kid(kid) if kid else None}
 
     # Additional methods as needed, following the structure from AuthenticationService example.
 
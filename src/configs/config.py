@@ -13,11 +13,96 @@ class Config:
     PUBLIC_KEY_PATH = os.getenv('PUBLIC_KEY_PATH', None)
     PRIVATE_KEY = os.getenv('PRIVATE_KEY', None)  # Directly use the key value from env
     PUBLIC_KEY = os.getenv('PUBLIC_KEY', None)  # Directly use the key value from env
+    # Key ring directory of *.pem files (private keys sign, public-only keys verify)
+    KEYS_DIR = os.getenv('KEYS_DIR', None)
+    ACTIVE_KID = os.getenv('ACTIVE_KID', None)  # Defaults to the newest private key in KEYS_DIR
+    KEY_RELOAD_INTERVAL_SECONDS = float(os.getenv('KEY_RELOAD_INTERVAL_SECONDS', 30))
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
     REFRESH_TOKEN_EXPIRE_MINUTES = int(os.getenv('REFRESH_TOKEN_EXPIRE_MINUTES', 43200))
-    POOL_SIZE = int(os.getenv('POOL_SIZE', 100))
+    POOL_SIZE = int(os.getenv('POOL_SIZE', 100))  # maxPoolSize of the shared MongoDB client
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 5))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000))
+    MONGO_WARMUP_CONNECTIONS = int(os.getenv('MONGO_WARMUP_CONNECTIONS', 5))  # Opened at startup
     MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'shopDEV')  # Default for all environments
-    
+    # Create the indexes declared by the DB managers at startup
+    MONGO_ENSURE_INDEXES = os.getenv('MONGO_ENSURE_INDEXES', 'true').lower() in ('1', 'true', 'yes')
+    # Password hashing worker pool ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR = os.getenv('PASSWORD_HASH_EXECUTOR', 'thread').lower()
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+    # In-process cache of `keys` documents used by the authentication path
+    KEY_CACHE_MAX_SIZE = int(os.getenv('KEY_CACHE_MAX_SIZE', 10000))
+    KEY_CACHE_TTL_SECONDS = float(os.getenv('KEY_CACHE_TTL_SECONDS', 30))
+    # In-process cache of user roles used by token refresh
+    USER_ROLE_CACHE_MAX_SIZE = int(os.getenv('USER_ROLE_CACHE_MAX_SIZE', 10000))
+    USER_ROLE_CACHE_TTL_SECONDS = float(os.getenv('USER_ROLE_CACHE_TTL_SECONDS', 300))
+    # Cache of already-verified token payloads, bounded by entries and approximate bytes
+    TOKEN_CACHE_MAX_SIZE = int(os.getenv('TOKEN_CACHE_MAX_SIZE', 50000))
+    TOKEN_CACHE_MAX_BYTES = int(os.getenv('TOKEN_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    # Queue between request handlers and the background log writer ("drop" or "block" when full)
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    LOG_QUEUE_POLICY = os.getenv('LOG_QUEUE_POLICY', 'drop').lower()
+    LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', 256))
+    # Access log: "text" or "json" lines, sampled per status class (0.0 - 1.0)
+    ACCESS_LOG_FORMAT = os.getenv('ACCESS_LOG_FORMAT', 'text').lower()
+    ACCESS_LOG_SAMPLE_2XX = float(os.getenv('ACCESS_LOG_SAMPLE_2XX', 1.0))
+    ACCESS_LOG_SAMPLE_3XX = float(os.getenv('ACCESS_LOG_SAMPLE_3XX', 1.0))
+    ACCESS_LOG_SAMPLE_4XX = float(os.getenv('ACCESS_LOG_SAMPLE_4XX', 1.0))
+    ACCESS_LOG_SAMPLE_5XX = float(os.getenv('ACCESS_LOG_SAMPLE_5XX', 1.0))
+    # Production launcher (server.py)
+    SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', 3055))
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', os.cpu_count() or 1))
+    SERVER_BACKLOG = int(os.getenv('SERVER_BACKLOG', 2048))
+    SERVER_KEEP_ALIVE_SECONDS = int(os.getenv('SERVER_KEEP_ALIVE_SECONDS', 5))
+    # Per-worker listener (port base + worker id) for scraping each worker's metrics; 0 disables it
+    SERVER_WORKER_HOST = os.getenv('SERVER_WORKER_HOST', '127.0.0.1')
+    SERVER_WORKER_PORT_BASE = int(os.getenv('SERVER_WORKER_PORT_BASE', 0))
+    # In-process cache of item documents read by id, bounded by entries and approximate bytes
+    ITEM_CACHE_MAX_SIZE = int(os.getenv('ITEM_CACHE_MAX_SIZE', 10000))
+    ITEM_CACHE_MAX_BYTES = int(os.getenv('ITEM_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    ITEM_CACHE_TTL_SECONDS = float(os.getenv('ITEM_CACHE_TTL_SECONDS', 60))
+    # Item listing: filtered "estimated_total" counts stop at this many documents
+    ITEMS_COUNT_LIMIT = int(os.getenv('ITEMS_COUNT_LIMIT', 10000))
+    # Bulk item import: rows per validated/bulk-written chunk, reported errors, max line size
+    ITEMS_IMPORT_CHUNK_SIZE = int(os.getenv('ITEMS_IMPORT_CHUNK_SIZE', 1000))
+    ITEMS_IMPORT_MAX_ERRORS = int(os.getenv('ITEMS_IMPORT_MAX_ERRORS', 1000))
+    ITEMS_IMPORT_MAX_LINE_BYTES = int(os.getenv('ITEMS_IMPORT_MAX_LINE_BYTES', 1024 * 1024))
+    # Item search: in-process index (falls back to the MongoDB text index while disabled or building),
+    # workers holding an index (comma-separated WORKER_IDs or "all"; the others use the MongoDB text index),
+    # full rebuild interval (0 = build once), documents indexed per worker-thread batch, prefix expansion cap,
+    # best matches counted in the facets (0 = all) and facet price bucket bounds
+    SEARCH_INDEX_ENABLED = os.getenv('SEARCH_INDEX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    SEARCH_INDEX_WORKERS = os.getenv('SEARCH_INDEX_WORKERS', '0')
+    SEARCH_REBUILD_INTERVAL_SECONDS = float(os.getenv('SEARCH_REBUILD_INTERVAL_SECONDS', 300))
+    SEARCH_BUILD_BATCH_SIZE = int(os.getenv('SEARCH_BUILD_BATCH_SIZE', 5000))
+    SEARCH_MAX_EXPANSIONS = int(os.getenv('SEARCH_MAX_EXPANSIONS', 50))
+    SEARCH_FACET_SCAN_LIMIT = int(os.getenv('SEARCH_FACET_SCAN_LIMIT', 10000))
+    SEARCH_PRICE_BUCKETS = os.getenv('SEARCH_PRICE_BUCKETS', '0,25,50,100,250,500,1000')
+    # Item export: documents per cursor batch and bytes per streamed chunk
+    ITEMS_EXPORT_BATCH_SIZE = int(os.getenv('ITEMS_EXPORT_BATCH_SIZE', 1000))
+    ITEMS_EXPORT_FLUSH_BYTES = int(os.getenv('ITEMS_EXPORT_FLUSH_BYTES', 64 * 1024))
+    # Response compression (Brotli, gzip fallback)
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_GZIP_FALLBACK = os.getenv('COMPRESSION_GZIP_FALLBACK', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESSION_EXCLUDED_TYPES = os.getenv(
+        'COMPRESSION_EXCLUDED_TYPES',
+        'image/,video/,audio/,font/woff,application/zip,application/gzip,application/x-brotli,'
+        'application/octet-stream,application/pdf')
+    # Compressed GET bodies under these path prefixes are cached by content digest
+    COMPRESSION_CACHE_PATHS = os.getenv('COMPRESSION_CACHE_PATHS', '/api/v1/items')
+    COMPRESSION_CACHE_SIZE = int(os.getenv('COMPRESSION_CACHE_SIZE', 512))
+    COMPRESSION_CACHE_MAX_BYTES = int(os.getenv('COMPRESSION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    COMPRESSION_CACHE_TTL_SECONDS = float(os.getenv('COMPRESSION_CACHE_TTL_SECONDS', 300))
+    # Validate service-built response dicts against the endpoint's response_model
+    # (disable in production to serialize trusted dicts directly)
+    RESPONSE_MODEL_VALIDATION = os.getenv('RESPONSE_MODEL_VALIDATION', 'true').lower() in ('1', 'true', 'yes')
+    # Prometheus-compatible /metrics endpoint and in-process instrumentation
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
     @staticmethod
     def load_private_key():
         try:
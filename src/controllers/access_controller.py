@@ -1,18 +1,19 @@
 # src/controllers/access_controller.py
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
 from src.models.user_models import (
     SignupRequestModel, LogoutRequestModel, 
     RenewAccessTokenResponseModel, RefreshTokenRequestModel, 
     ChangePasswordRequestModel
 )
+from src.core.json_response import FastJSONResponse, trusted_response
+from typing import Optional
 from src.services.user_service import UserService
 
 class AccessController:
-    def __init__(self) -> None:
-        self.user_service = UserService()
+    def __init__(self, user_service: Optional[UserService] = None) -> None:
+        self.user_service = user_service or UserService()
 
-    async def signup_user(self, signup_request: SignupRequestModel) -> JSONResponse:
+    async def signup_user(self, signup_request: SignupRequestModel) -> FastJSONResponse:
         """
         Registers a new user with the given signup request data.
 
@@ -25,9 +26,9 @@ class AccessController:
         result = await self.user_service.register_user(signup_request)
         if "error" in result:
             raise HTTPException(status_code=result["status"], detail=result["error"])
-        return JSONResponse(status_code=201, content=result)
+        return FastJSONResponse(status_code=201, content=result)
 
-    async def login_user(self, email: str, password: str) -> JSONResponse:
+    async def login_user(self, email: str, password: str) -> FastJSONResponse:
         """
         Authenticates a user and generates JWT access and refresh tokens.
 
@@ -42,9 +43,9 @@ class AccessController:
         
         if "error" in result:
             raise HTTPException(status_code=result["status"], detail=result["error"])
-        return JSONResponse(status_code=200, content=result.get('data'))
+        return FastJSONResponse(status_code=200, content=result.get('data'))
 
-    async def change_password(self, change_pwd_request: ChangePasswordRequestModel) -> JSONResponse:
+    async def change_password(self, change_pwd_request: ChangePasswordRequestModel) -> FastJSONResponse:
         """
         Updates the user's password.
 
@@ -60,7 +61,7 @@ class AccessController:
                 current_password=change_pwd_request.current_password,
                 new_password=change_pwd_request.new_password
             )
-            return JSONResponse(status_code=200, content=result)
+            return FastJSONResponse(status_code=200, content=result)
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -80,13 +81,13 @@ class AccessController:
             result = await self.user_service.renew_access_token(refresh_request.refresh_token)
             if "error" in result:
                 raise HTTPException(status_code=result["status"], detail=result["error"])
-            return result
+            return trusted_response(result, RenewAccessTokenResponseModel)
         except HTTPException as e:
             raise e
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
 
-    async def logout_user(self, logout_request: LogoutRequestModel) -> JSONResponse:
+    async def logout_user(self, logout_request: LogoutRequestModel) -> FastJSONResponse:
         """
         Logs out a user by invalidating their current refresh token.
 
@@ -100,7 +101,7 @@ class AccessController:
             result = await self.user_service.logout(logout_request.user_id, logout_request.refresh_token)
             if "error" in result:
                 raise HTTPException(status_code=result["status"], detail=result["error"])
-            return JSONResponse(status_code=200, content={"message": "Successfully logged out"})
+            return FastJSONResponse(status_code=200, content={"message": "Successfully logged out"})
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -0,0 +1,110 @@
+# src/controllers/item_controller.py
+from typing import AsyncIterator, List, Optional
+from fastapi.responses import StreamingResponse
+from src.core.json_response import FastJSONResponse
+from src.models.category_enum_models import CategoryEnum
+from src.models.item_models import ItemSort, ItemState
+from src.services.item_service import ItemService
+from src.services.search_service import SearchService
+
+class ItemController:
+    def __init__(self, item_service: Optional[ItemService] = None,
+                 search_service: Optional[SearchService] = None) -> None:
+        self.item_service = item_service or ItemService()
+        self.search_service = search_service or SearchService(self.item_service.item_db_manager)
+
+    async def get_item(self, item_id: str) -> FastJSONResponse:
+        """
+        Retrieves one item by id.
+
+        Args:
+            item_id: The item's ObjectId as a string.
+
+        Returns:
+            The item document.
+        """
+        result = await self.item_service.get_item(item_id)
+        return FastJSONResponse(status_code=200, content=result)
+
+    async def list_items(self, limit: int, cursor: Optional[str], sort: ItemSort,
+                         category: Optional[CategoryEnum], state: Optional[ItemState],
+                         min_price: Optional[float], max_price: Optional[float],
+                         include_total: bool) -> FastJSONResponse:
+        """
+        Lists one page of the item catalog.
+
+        Args:
+            limit: Maximum number of items on the page.
+            cursor: Opaque cursor from the previous page, if any.
+            sort: The sort order.
+            category: Optional category filter.
+            state: Optional item state filter.
+            min_price: Optional lower price bound.
+            max_price: Optional upper price bound.
+            include_total: Whether to include an estimated total.
+
+        Returns:
+            A JSONResponse containing the page of items and the next cursor.
+        """
+        result = await self.item_service.list_items(
+            limit=limit, cursor=cursor, sort=sort, category=category, state=state,
+            min_price=min_price, max_price=max_price, include_total=include_total
+        )
+        return FastJSONResponse(status_code=200, content=result)
+
+    async def search_items(self, text: str, limit: int, offset: int,
+                           category: Optional[CategoryEnum], state: Optional[ItemState],
+                           min_price: Optional[float], max_price: Optional[float]) -> FastJSONResponse:
+        """
+        Searches the item catalog.
+
+        Args:
+            text: The search terms.
+            limit: Maximum number of items to return.
+            offset: Number of best matches to skip.
+            category, state, min_price, max_price: Optional filters.
+
+        Returns:
+            The ranked items with facet counts.
+        """
+        result = await self.search_service.search_items(text, limit, offset, category, state, min_price, max_price)
+        return FastJSONResponse(status_code=200, content=result)
+
+    async def import_items(self, chunks: AsyncIterator[bytes], file_format: str, user_id: str) -> FastJSONResponse:
+        """
+        Bulk-imports items from an NDJSON or CSV request body.
+
+        Args:
+            chunks: The request body stream.
+            file_format: "ndjson" or "csv".
+            user_id: The authenticated user importing the items.
+
+        Returns:
+            A JSONResponse with the import counts and per-row errors.
+        """
+        result = await self.item_service.import_items(chunks, file_format, user_id)
+        return FastJSONResponse(status_code=200, content=result)
+
+    async def export_items(self, file_format: str, fields: Optional[List[str]],
+                           category: Optional[CategoryEnum], state: Optional[ItemState],
+                           min_price: Optional[float], max_price: Optional[float],
+                           user: Optional[str]) -> StreamingResponse:
+        """
+        Streams the matching items as an NDJSON or CSV download.
+
+        Args:
+            file_format: "ndjson" or "csv".
+            fields: Optional list of fields to export.
+            category, state, min_price, max_price, user: Optional filters.
+
+        Returns:
+            A StreamingResponse with the exported items.
+        """
+        body = self.item_service.export_items(
+            file_format, fields=fields, category=category, state=state,
+            min_price=min_price, max_price=max_price, user=user
+        )
+        media_type = "text/csv; charset=utf-8" if file_format == "csv" else "application/x-ndjson"
+        return StreamingResponse(body, media_type=media_type, headers={
+            "Content-Disposition": f'attachment; filename="items.{file_format}"'
+        })
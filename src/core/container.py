@@ -0,0 +1,66 @@
+# src/core/container.py
+
+from fastapi import Request
+from src.controllers.access_controller import AccessController
+from src.controllers.item_controller import ItemController
+from src.dbs.init_mongodb import Database
+from src.dbs.item_db_manager import ItemDBManager
+from src.dbs.key_db_manager import KeyDBManager
+from src.dbs.user_db_manager import UserDBManager
+from src.services.item_service import ItemService
+from src.services.search_service import SearchService
+from src.services.user_service import UserService
+
+
+class ServiceContainer:
+    """
+    Application-scoped instances of the DB managers, services and controllers.
+
+    Created once in the application lifespan and stored on `app.state.container`;
+    request dependencies hand out these shared instances instead of building a
+    new controller -> service -> manager chain on every request.
+
+    Attributes:
+        database (Database): The shared MongoDB connection.
+        user_db_manager (UserDBManager): Manager for the `users` collection.
+        key_db_manager (KeyDBManager): Manager for the `keys` collection.
+        item_db_manager (ItemDBManager): Manager for the item collections.
+        user_service (UserService): User and token business logic.
+        access_controller (AccessController): Controller behind the users router.
+        item_service (ItemService): Item catalog business logic.
+        search_service (SearchService): Item search, kept up to date with item writes.
+        item_controller (ItemController): Controller behind the items router.
+    """
+
+    def __init__(self, database: Database):
+        self.database = database
+        self.user_db_manager = UserDBManager(database)
+        self.key_db_manager = KeyDBManager(database)
+        self.item_db_manager = ItemDBManager(database)
+        self.user_service = UserService(self.user_db_manager, self.key_db_manager)
+        self.access_controller = AccessController(self.user_service)
+        self.item_service = ItemService(self.item_db_manager)
+        self.search_service = SearchService(self.item_db_manager)
+        self.item_controller = ItemController(self.item_service, self.search_service)
+
+    async def start(self):
+        """
+        Resolves the database handle once and binds it to every manager, so
+        request paths no longer go through the lazy `get_db` connection check.
+        """
+        db = await self.database.get_db()
+        for manager in (self.user_db_manager, self.key_db_manager, self.item_db_manager):
+            manager.bind(db)
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """
+    Dependency returning the container created in the application lifespan.
+
+    Raises:
+        RuntimeError: If the application was started without its lifespan.
+    """
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        raise RuntimeError("Service container is not initialized; was the application lifespan run?")
+    return container
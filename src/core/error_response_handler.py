@@ -36,4 +36,8 @@ class ErrorResponseHandler:
     def unauthorized(cls, detail: str = "Unauthorized access"):
         cls.raise_http_exception(status_code=401, detail=detail)
 
+    @classmethod
+    def service_unavailable(cls, detail: str = "Service temporarily unavailable"):
+        cls.raise_http_exception(status_code=503, detail=detail)
+
     # Additional methods can be added as needed for different error scenarios
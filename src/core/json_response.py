@@ -0,0 +1,71 @@
+# src/core/json_response.py
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional, Type, Union
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from src.configs.config import CurrentConfig
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any):
+    """Encodes the types that show up in MongoDB documents and service results."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes content to compact UTF-8 JSON, natively handling ObjectId,
+    datetime and enums (orjson encodes datetimes and enums itself).
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False,
+                      allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed. Used as the
+    application's default response class and by the controllers.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_response(content: dict, response_model: Optional[Type[BaseModel]] = None,
+                     status_code: int = 200) -> Union[dict, FastJSONResponse]:
+    """
+    Returns a service-built dict for an endpoint that declares `response_model`.
+
+    With RESPONSE_MODEL_VALIDATION enabled the dict is returned as is and FastAPI
+    validates it against the endpoint's response model. When disabled, the dict
+    is trusted: it is only trimmed to the model's fields and serialized directly,
+    skipping the pydantic round-trip.
+
+    Parameters:
+    - content (dict): The response body built by the service layer.
+    - response_model (Optional[Type[BaseModel]]): The endpoint's response model.
+    - status_code (int): The HTTP status code when validation is skipped.
+    """
+    if CurrentConfig.RESPONSE_MODEL_VALIDATION:
+        return content
+    if response_model is not None:
+        content = {key: value for key, value in content.items() if key in response_model.__fields__}
+    return FastJSONResponse(status_code=status_code, content=content)
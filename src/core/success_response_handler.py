@@ -1,5 +1,7 @@
 # src/core/success_response_handler.py
 
+from typing import Optional
+
 class SuccessResponseHandler:
     """
     Handles success responses for API endpoints, providing a unified structure and facilitating
@@ -107,6 +109,37 @@ class SuccessResponseHandler:
             "status": 200
         }
 
+    @staticmethod
+    def cursor_paginated_response(data: list, limit: int, next_cursor: Optional[str] = None,
+                                  total: Optional[int] = None,
+                                  message: str = "Data retrieved successfully") -> dict:
+        """
+        Generates a success response for keyset (cursor) paginated data.
+
+        Parameters:
+        - data (list): The list of data items for the current page.
+        - limit (int): The maximum number of items per page.
+        - next_cursor (Optional[str]): Opaque cursor for the next page, None on the last page.
+        - total (Optional[int]): Estimated number of matching items, if requested.
+        - message (str, optional): A success message. Defaults to "Data retrieved successfully".
+
+        Returns:
+        - dict: The paginated success response, including the cursor for the next page.
+        """
+        pagination = {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }
+        if total is not None:
+            pagination["estimated_total"] = total
+        return {
+            "message": message,
+            "data": data,
+            "pagination": pagination,
+            "status": 200
+        }
+
     @staticmethod
     def renewed_access_token(access_token: str, refresh_token, role: str) -> dict:
         """
@@ -1,20 +1,39 @@
 # src/dbs/base_db_manager.py
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
+from pymongo import IndexModel
 from src.dbs.init_mongodb import Database
+from src.dbs.index_registry import index_registry
 from src.helpers.log_config import setup_logger
 
 class BaseDBManager:
     """
     BaseDBManager provides shared functionalities for database operations.
+
+    Subclasses declare the indexes their queries rely on in `indexes`
+    (collection name -> list of IndexModel); they are registered with the
+    index registry and created at application startup.
     """
     
     logger = setup_logger()
+    indexes: Dict[str, List[IndexModel]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for collection, index_models in cls.__dict__.get("indexes", {}).items():
+            index_registry.register(collection, *index_models)
     
     def __init__(self, db: Optional[Database] = None):
         self._db_instance = db or Database()
         self._db = None
     
+    def bind(self, db):
+        """
+        Binds an already-resolved database handle, skipping the lazy lookup
+        in `get_db`. Called once at startup for the shared managers.
+        """
+        self._db = db
+
     async def get_db(self):
         if self._db is None:
             try:
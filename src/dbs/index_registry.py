@@ -0,0 +1,147 @@
+# src/dbs/index_registry.py
+
+import asyncio
+import sys
+from typing import Dict, List
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+from src.helpers.log_config import setup_logger
+
+# Index options compared when checking whether an existing index matches its declaration
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+# Default language the server reports for text indexes declared without one
+_DEFAULT_TEXT_LANGUAGE = "english"
+
+
+def _key_spec(index: dict) -> list:
+    """
+    The key of an index as comparable (field, type) pairs. The server stores
+    text indexes as `_fts`/`_ftsx` with the fields in `weights`, so text keys
+    are normalized to ("$text", fields) on both sides.
+    """
+    key = index["key"]
+    pairs = list(key.items()) if hasattr(key, "items") else [tuple(pair) for pair in key]
+    text_fields = sorted(field for field, kind in pairs if kind == "text")
+    if "_fts" in dict(pairs):
+        text_fields = sorted(index.get("weights", {}))
+    plain = [(field, kind) for field, kind in pairs if kind != "text" and field not in ("_fts", "_ftsx")]
+    return plain + ([("$text", text_fields)] if text_fields else [])
+
+
+def _options(index: dict) -> dict:
+    """Options compared between declaration and server, with text index defaults filled in."""
+    options = {option: index.get(option) for option in _COMPARED_OPTIONS}
+    for field, text_fields in _key_spec(index):
+        if field == "$text":
+            weights = index.get("weights") or {}
+            options["weights"] = {text_field: weights.get(text_field, 1) for text_field in text_fields}
+            options["default_language"] = index.get("default_language", _DEFAULT_TEXT_LANGUAGE)
+    return options
+
+
+class IndexRegistry:
+    """
+    Collects the MongoDB indexes declared by the DB managers and applies them.
+
+    DB managers declare their indexes in an `indexes` class attribute mapping a
+    collection name to a list of `pymongo.IndexModel`; `BaseDBManager` registers
+    them here when the subclass is defined.
+    """
+
+    logger = setup_logger()
+
+    def __init__(self):
+        self._indexes: Dict[str, Dict[str, IndexModel]] = {}
+
+    def register(self, collection: str, *index_models: IndexModel):
+        """
+        Declares indexes for a collection. Re-declaring an index with the same
+        name replaces the earlier declaration.
+        """
+        declared = self._indexes.setdefault(collection, {})
+        for index_model in index_models:
+            declared[index_model.document["name"]] = index_model
+
+    def declared(self) -> Dict[str, List[IndexModel]]:
+        """Returns the declared indexes grouped by collection."""
+        return {collection: list(models.values()) for collection, models in self._indexes.items()}
+
+    async def report(self, db) -> Dict[str, dict]:
+        """
+        Compares the declared indexes with the ones present in the database.
+
+        Parameters:
+            db: The Motor database.
+
+        Returns:
+            Per collection, the names of `missing` indexes, of indexes whose
+            keys or options `differ` from their declaration, and of
+            `undeclared` indexes (other than `_id_`) left over from earlier
+            declarations, which are candidates for dropping.
+        """
+        result = {}
+        for collection, models in self._indexes.items():
+            existing = await db[collection].index_information()
+            missing, differ = [], []
+            for name, index_model in models.items():
+                document = index_model.document
+                current = existing.get(name)
+                if current is None:
+                    missing.append(name)
+                elif _key_spec(current) != _key_spec(document) or _options(current) != _options(document):
+                    differ.append(name)
+            undeclared = sorted(name for name in existing if name != "_id_" and name not in models)
+            result[collection] = {"missing": missing, "differ": differ, "undeclared": undeclared}
+        return result
+
+    async def apply(self, db, dry_run: bool = False) -> Dict[str, dict]:
+        """
+        Creates the declared indexes that are missing. Existing indexes are left
+        untouched, so this is safe to run on every startup; indexes that differ
+        from their declaration are only reported, never dropped.
+
+        Parameters:
+            db: The Motor database.
+            dry_run: Only report what would be created.
+
+        Returns:
+            The report from `report()`, taken before any index was created.
+        """
+        report = await self.report(db)
+        for collection, status in report.items():
+            for name in status["differ"]:
+                self.logger.warning(f"Index {collection}.{name} differs from its declaration; drop it to recreate")
+            for name in status["undeclared"]:
+                self.logger.warning(f"Index {collection}.{name} is no longer declared; drop it if nothing else uses it")
+            if dry_run or not status["missing"]:
+                continue
+            models = [self._indexes[collection][name] for name in status["missing"]]
+            try:
+                await db[collection].create_indexes(models)
+                self.logger.info(f"Created indexes on {collection}: {', '.join(status['missing'])}")
+            except OperationFailure as e:
+                self.logger.error(f"Failed to create indexes on {collection}: {e}")
+        return report
+
+
+index_registry = IndexRegistry()
+
+
+async def _print_report(apply: bool):
+    # Import the managers so their index declarations are registered
+    from src.dbs import item_db_manager, key_db_manager, user_db_manager  # noqa: F401
+    from src.dbs.init_mongodb import Database
+
+    database = Database()
+    db = await database.get_db()
+    report = await index_registry.apply(db, dry_run=not apply)
+    for collection, status in report.items():
+        print(f"{collection}: missing={status['missing'] or '-'} differ={status['differ'] or '-'} "
+              f"undeclared={status['undeclared'] or '-'}")
+    await database.disconnect()
+
+
+if __name__ == "__main__":
+    # python -m src.dbs.index_registry          -> dry-run report of missing indexes
+    # python -m src.dbs.index_registry --apply  -> create the missing indexes
+    asyncio.run(_print_report(apply="--apply" in sys.argv[1:]))
@@ -2,32 +2,121 @@
 
 from src.helpers.check_connect import monitor_system_resources
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from src.configs.config import CurrentConfig
+from src.helpers import metrics
 import asyncio
+import os
+import threading
+from typing import Optional
 from src.helpers.log_config import setup_logger
 
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Tracks connection-pool activity of the Motor client for the metrics endpoint.
+
+    pymongo publishes these events from the threads that run the blocking
+    driver calls, so counters are updated under a lock rather than relying on
+    the event loop like the other metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open_connections = 0
+        self.checked_out = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            MONGO_POOL_CHECKOUT_FAILURES.inc(event.reason)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+            if event.duration is not None:
+                MONGO_POOL_CHECKOUT_SECONDS.observe(event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+
+MONGO_POOL_CHECKOUT_SECONDS = metrics.registry.register(metrics.Histogram(
+    "mongodb_pool_checkout_seconds", "Time spent waiting to check a connection out of the MongoDB pool."))
+MONGO_POOL_CHECKOUT_FAILURES = metrics.registry.register(metrics.Counter(
+    "mongodb_pool_checkout_failures_total", "Failed MongoDB pool checkouts by reason (e.g. timeout).",
+    ("reason",)))
+
+pool_metrics_listener = PoolMetricsListener()
+metrics.registry.register(metrics.CallbackMetric(
+    "mongodb_pool_connections", "Connections currently open in this process's MongoDB pool.",
+    lambda: pool_metrics_listener.open_connections))
+metrics.registry.register(metrics.CallbackMetric(
+    "mongodb_pool_checked_out", "MongoDB pool connections currently checked out.",
+    lambda: pool_metrics_listener.checked_out))
+
+
 class Database:
     """
-    Singleton class for managing the database connection to MongoDB asynchronously.
+    Process-wide singleton managing the asynchronous MongoDB connection.
+
+    Every `Database()` call returns the same instance, so all DB managers share
+    one Motor client and therefore one connection pool per worker process.
 
     Attributes:
         _instance (Database): The singleton instance of the Database class.
         _is_connected (bool): Flag to indicate if the connection to MongoDB is established.
-        _lock (asyncio.Lock): Lock for thread-safe operations in asynchronous context.
+        _lock (asyncio.Lock): Lock serializing connect/disconnect; created on first use
+            so it belongs to the running event loop.
         logger (logging.Logger): Logger for logging database connection activities.
 
     Methods:
         get_instance: Class method to get the singleton instance of the Database class.
         connect: Asynchronously establishes a connection to MongoDB.
+        warm_up: Opens pool connections ahead of the first requests.
         disconnect: Asynchronously closes the connection to MongoDB.
         get_db: Returns the database connection if connected, otherwise attempts to connect first.
     """
 
     _instance = None
-    _is_connected = False
-    _lock = asyncio.Lock()
+    _instance_lock = threading.Lock()
     logger = setup_logger()
 
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(Database, cls).__new__(cls)
+                    instance._init()
+                    cls._instance = instance
+        return cls._instance
+
     @classmethod
     async def get_instance(cls):
         """
@@ -36,46 +125,73 @@ class Database:
         Returns:
             The singleton instance of the Database class.
         """
-        async with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(Database, cls).__new__(cls)
-                cls._instance._init()  # Initialize the instance
-            return cls._instance
+        return cls()
 
     def _init(self):
-        """Initializes the Database instance; a substitute for __init__."""
-        if not hasattr(self, '_initialized'):  # Prevent re-initialization
-            self._client = None
-            self._db = None
-            self._initialized = True
+        """Resets the connection state; used on creation and in forked children."""
+        self._client = None
+        self._db = None
+        self._is_connected = False
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
 
     async def connect(self):
         """
         Asynchronously establishes a connection to MongoDB using the configuration
-        specified in CurrentConfig.
+        and pool settings specified in CurrentConfig.
         """
-        async with self._lock:
+        async with self._get_lock():
             if not self._is_connected:
                 try:
-                    connection_string = CurrentConfig.MONGO_CONNECTION_STRING
-                    db_name = CurrentConfig.MONGO_DB_NAME
-                    pool_size = CurrentConfig.POOL_SIZE
-
-                    self._client = AsyncIOMotorClient(connection_string, maxPoolSize=pool_size)
-                    self._db = self._client[db_name]
+                    self._client = AsyncIOMotorClient(
+                        CurrentConfig.MONGO_CONNECTION_STRING,
+                        maxPoolSize=CurrentConfig.POOL_SIZE,
+                        minPoolSize=CurrentConfig.MONGO_MIN_POOL_SIZE,
+                        maxIdleTimeMS=CurrentConfig.MONGO_MAX_IDLE_TIME_MS,
+                        waitQueueTimeoutMS=CurrentConfig.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                        event_listeners=[pool_metrics_listener],
+                    )
+                    self._db = self._client[CurrentConfig.MONGO_DB_NAME]
                     self._is_connected = True
-                    self.logger.info("Connected to MongoDB")
+                    self.logger.info(f"Connected to MongoDB (pool {CurrentConfig.MONGO_MIN_POOL_SIZE}"
+                                     f"-{CurrentConfig.POOL_SIZE} connections)")
                 except Exception as e:
                     self.logger.error(f"Failed to connect to MongoDB: {e}")
                     self._is_connected = False
 
+    async def warm_up(self, connections: int = CurrentConfig.MONGO_WARMUP_CONNECTIONS):
+        """
+        Opens pool connections before the first requests arrive by running
+        concurrent `ping` commands, each of which checks out its own connection.
+        Failures are logged; the pool then fills lazily as usual.
+
+        Parameters:
+            connections (int): Number of connections to open.
+        """
+        if connections <= 0:
+            return
+        db = await self.get_db()
+        if db is None:
+            return
+        try:
+            await asyncio.gather(*(db.command("ping") for _ in range(connections)))
+            self.logger.info(f"Warmed up {connections} MongoDB connections")
+        except Exception as e:
+            self.logger.warning(f"MongoDB connection warm-up failed: {e}")
+
     async def disconnect(self):
         """
         Asynchronously closes the MongoDB connection.
         """
-        async with self._lock:
+        async with self._get_lock():
             if self._is_connected and self._client is not None:
                 self._client.close()
+                self._client = None
+                self._db = None
                 self._is_connected = False
                 self.logger.info("Disconnected from MongoDB")
 
@@ -90,8 +206,30 @@ class Database:
             await self.connect()
         return self._db
 
-async def start_monitoring():
+    async def get_client(self):
+        """
+        Returns the shared MongoDB client, establishing the connection if necessary.
+
+        Returns:
+            The AsyncIOMotorClient, or None if the connection could not be established.
+        """
+        if not self._is_connected:
+            await self.connect()
+        return self._client
+
+
+def _reset_database_after_fork():
+    # A Motor client must not be shared across fork(); the child opens its own pool
+    if Database._instance is not None:
+        Database._instance._init()
+
+
+os.register_at_fork(after_in_child=_reset_database_after_fork)
+
+
+async def start_monitoring(database: Database):
     """
-    Starts the system resource monitoring process asynchronously.
+    Starts the system resource monitoring process asynchronously,
+    reusing the given database's client.
     """
-    await monitor_system_resources()
+    await monitor_system_resources(database)
@@ -1,19 +1,91 @@
 # path/filename: src/dbs/item_db_manager.py
 
-from typing import Optional
+import copy
+import sys
+from typing import AsyncIterator, List, Optional, Tuple
+from src.configs.config import CurrentConfig
 from src.dbs.base_db_manager import BaseDBManager
+from src.helpers import metrics
+from src.helpers.metrics import track_db_operation, register_cache
+from src.utils.cache import SingleFlight, TTLCache
 from pymongo.results import InsertOneResult, DeleteResult, UpdateResult
+from pymongo.errors import BulkWriteError
+from pymongo import InsertOne
 from datetime import datetime
 from bson import ObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+
+def _item_weight(item: dict) -> int:
+    """Approximates the memory held by a cached item document."""
+    size = sys.getsizeof(item)
+    for key, value in item.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(sys.getsizeof(nested) for nested in value.values())
+        elif isinstance(value, list):
+            size += sum(sys.getsizeof(nested) for nested in value)
+    return size
+
 
 class ItemDBManager(BaseDBManager):
     """
     Manages database operations related to items using Motor for asynchronous access.
+
+    Item documents read by id are cached in-process, bounded by entry count and
+    approximate bytes. Concurrent misses for the same id share one query, and
+    `update_item`/`delete_item_by_id` invalidate the local entry; other worker
+    processes pick up changes once their entry expires (ITEM_CACHE_TTL_SECONDS).
     """
 
+    # The listing filters on category/state by equality and pages by keyset on
+    # (price, _id) or _id alone, so each index ends with the full sort key.
+    indexes = {
+        "items": [
+            IndexModel([("category", ASCENDING), ("state", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)],
+                       name="category_state_price_id"),
+            IndexModel([("state", ASCENDING), ("price", ASCENDING), ("_id", ASCENDING)], name="state_price_id"),
+            IndexModel([("category", ASCENDING), ("state", ASCENDING), ("_id", DESCENDING)],
+                       name="category_state_id"),
+            IndexModel([("state", ASCENDING), ("_id", DESCENDING)], name="state_id"),
+            IndexModel([("user", ASCENDING)], name="user"),
+            # Fallback for search while the in-process index is unavailable
+            IndexModel([("name", TEXT), ("tags", TEXT), ("description", TEXT)],
+                       weights={"name": 3, "tags": 2, "description": 1}, default_language="none",
+                       name="name_tags_description_text"),
+        ],
+    }
+
+    item_cache = TTLCache(maxsize=CurrentConfig.ITEM_CACHE_MAX_SIZE,
+                          ttl=CurrentConfig.ITEM_CACHE_TTL_SECONDS,
+                          name="items",
+                          max_weight=CurrentConfig.ITEM_CACHE_MAX_BYTES,
+                          weigher=_item_weight)
+    item_loads = SingleFlight()
+
+    def __init__(self, db=None):
+        super().__init__(db)
+        self._change_listeners = []
+
+    def add_change_listener(self, listener):
+        """
+        Registers an object notified after items are written through this
+        manager: `item_saved(document)` after an insert or update and
+        `item_deleted(item_id)` after a delete. Used to keep in-process
+        derived data (e.g. the search index) in step with the collection.
+        """
+        self._change_listeners.append(listener)
+
+    def _notify(self, event: str, *args):
+        for listener in self._change_listeners:
+            try:
+                getattr(listener, event)(*args)
+            except Exception as e:
+                self.logger.error(f"Item change listener failed on {event}: {e}")
+
     async def find_item_by_id(self, item_id: str) -> Optional[dict]:
         """
-        Finds an item document by its ObjectId asynchronously.
+        Finds an item document by its ObjectId, serving it from the item cache
+        when possible. Callers receive their own copy of the cached document.
 
         Parameters:
             item_id: The string representation of the item's ObjectId.
@@ -21,6 +93,24 @@ class ItemDBManager(BaseDBManager):
         Returns:
             The item document if found, None otherwise.
         """
+        item_id = str(item_id)
+        item = self.item_cache.get(item_id)
+        if item is None:
+            item = await self.item_loads.run(item_id, lambda: self._fetch_item(item_id),
+                                             lambda loaded: self._cache_item(item_id, loaded))
+        return copy.deepcopy(item)
+
+    def _cache_item(self, item_id: str, item: Optional[dict]):
+        if item is not None:
+            self.item_cache.set(item_id, item)
+
+    def _invalidate_item(self, item_id: str):
+        self.item_cache.invalidate(item_id)
+        self.item_loads.forget(item_id)  # A read in flight may predate the write
+
+    @track_db_operation
+    async def _fetch_item(self, item_id: str) -> Optional[dict]:
+        """Reads an item document from MongoDB, bypassing the cache."""
         try:
             db_instance = await self.get_db()
             item = await db_instance["items"].find_one({"_id": ObjectId(item_id)})
@@ -29,6 +119,117 @@ class ItemDBManager(BaseDBManager):
             self.logger.error(f"Error finding an item by ID: {e}")
             raise
 
+    @track_db_operation
+    async def find_items(self, query: dict, sort: List[Tuple[str, int]], limit: int) -> List[dict]:
+        """
+        Finds up to `limit` item documents matching `query` in the given order.
+
+        Parameters:
+            query: The MongoDB filter, including any keyset condition.
+            sort: The sort specification.
+            limit: Maximum number of documents to return.
+
+        Returns:
+            The matching item documents.
+        """
+        try:
+            db_instance = await self.get_db()
+            cursor = db_instance["items"].find(query, sort=sort, limit=limit, batch_size=limit)
+            return await cursor.to_list(length=limit)
+        except Exception as e:
+            self.logger.error(f"Error listing items: {e}")
+            raise
+
+    async def iter_items(self, query: dict, projection: Optional[dict] = None,
+                         batch_size: int = 1000) -> AsyncIterator[dict]:
+        """
+        Iterates over all items matching `query` in `_id` order, fetching
+        `batch_size` documents per round trip so memory stays constant however
+        many items match. The cursor is closed if the consumer stops early.
+
+        Parameters:
+            query: The MongoDB filter.
+            projection: Optional projection of the returned fields.
+            batch_size: Number of documents per getMore batch.
+
+        Yields:
+            The matching item documents.
+        """
+        db_instance = await self.get_db()
+        cursor = db_instance["items"].find(query, projection, sort=[("_id", ASCENDING)], batch_size=batch_size)
+        try:
+            async for item in cursor:
+                yield item
+        finally:
+            await cursor.close()
+
+    @track_db_operation
+    async def count_items(self, query: dict, limit: Optional[int] = None) -> int:
+        """
+        Counts the items matching `query`. Without a filter the count comes from
+        collection metadata; otherwise counting stops at `limit` documents.
+
+        Parameters:
+            query: The MongoDB filter.
+            limit: Upper bound for filtered counts.
+
+        Returns:
+            The (possibly estimated or capped) number of matching items.
+        """
+        try:
+            db_instance = await self.get_db()
+            if not query:
+                return await db_instance["items"].estimated_document_count()
+            options = {"limit": limit} if limit else {}
+            return await db_instance["items"].count_documents(query, **options)
+        except Exception as e:
+            self.logger.error(f"Error counting items: {e}")
+            raise
+
+    @track_db_operation
+    async def text_search(self, text: str, query: dict, skip: int, limit: int,
+                          price_boundaries: List[float]) -> dict:
+        """
+        Searches items with the MongoDB text index, ranked by text score, and
+        counts the matches by category, state and price bucket in the same
+        aggregation.
+
+        Parameters:
+            text: The search terms.
+            query: Additional MongoDB filter.
+            skip: Number of best matches to skip.
+            limit: Maximum number of items to return.
+            price_boundaries: Ascending lower bounds of the price buckets.
+
+        Returns:
+            A dict with `items` (each with a `score`), `total` and the raw
+            `category`, `state` and `price` facet groups.
+        """
+        try:
+            db_instance = await self.get_db()
+            pipeline = [
+                {"$match": {"$text": {"$search": text}, **query}},
+                {"$facet": {
+                    "items": [
+                        {"$addFields": {"score": {"$meta": "textScore"}}},
+                        {"$sort": {"score": -1, "_id": 1}},
+                        {"$skip": skip},
+                        {"$limit": limit},
+                    ],
+                    "total": [{"$count": "count"}],
+                    "category": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}],
+                    "state": [{"$group": {"_id": "$state", "count": {"$sum": 1}}}],
+                    "price": [{"$bucket": {"groupBy": "$price", "boundaries": price_boundaries,
+                                           "default": "overflow", "output": {"count": {"$sum": 1}}}}],
+                }},
+            ]
+            result = await db_instance["items"].aggregate(pipeline).to_list(length=1)
+            return result[0] if result else {}
+        except Exception as e:
+            self.logger.error(f"Error searching items: {e}")
+            raise
+
+    @track_db_operation
     async def insert_item(self, item_data: dict) -> InsertOneResult:
         """
         Inserts a new item document asynchronously.
@@ -42,11 +243,45 @@ class ItemDBManager(BaseDBManager):
         try:
             db_instance = await self.get_db()
             result = await db_instance["items"].insert_one(item_data)
+            self._notify("item_saved", item_data)
             return result
         except Exception as e:
             self.logger.error(f"Error inserting an item: {e}")
             raise
 
+    @track_db_operation
+    async def bulk_insert_items(self, documents: List[dict]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Inserts a chunk of item documents with one unordered bulk write, so a
+        failing document (e.g. a duplicate key) does not stop the others.
+
+        Parameters:
+            documents: The item documents to insert.
+
+        Returns:
+            The number of inserted documents, and (index in `documents`, error
+            message) for each document that was rejected.
+        """
+        try:
+            db_instance = await self.get_db()
+            result = await db_instance["items"].bulk_write([InsertOne(document) for document in documents],
+                                                           ordered=False)
+            for document in documents:
+                self._notify("item_saved", document)
+            return result.inserted_count, []
+        except BulkWriteError as e:
+            details = e.details
+            errors = [(error["index"], error.get("errmsg", "Write error")) for error in details.get("writeErrors", [])]
+            rejected = {index for index, _ in errors}
+            for index, document in enumerate(documents):
+                if index not in rejected:
+                    self._notify("item_saved", document)
+            return details.get("nInserted", 0), errors
+        except Exception as e:
+            self.logger.error(f"Error bulk inserting items: {e}")
+            raise
+
+    @track_db_operation
     async def delete_item_by_id(self, item_id: str) -> DeleteResult:
         """
         Deletes an item document by its ObjectId.
@@ -63,11 +298,15 @@ class ItemDBManager(BaseDBManager):
         try:
             db_instance = await self.get_db()
             result = await db_instance["items"].delete_one({"_id": ObjectId(item_id)})
+            self._invalidate_item(str(item_id))
+            if result.deleted_count:
+                self._notify("item_deleted", str(item_id))
             return result
         except Exception as e:
             self.logger.error(f"Error deleting item by ID: {e}")
             raise
 
+    @track_db_operation
     async def update_item(self, item_id: str, update_data: dict) -> UpdateResult:
         """
         Updates an item document.
@@ -85,7 +324,19 @@ class ItemDBManager(BaseDBManager):
         try:
             db_instance = await self.get_db()
             result = await db_instance["items"].update_one({"_id": ObjectId(item_id)}, {'$set': update_data})
+            self._invalidate_item(str(item_id))
+            if result.modified_count and self._change_listeners:
+                # Listeners need the whole document, not just the changed fields
+                item = await db_instance["items"].find_one({"_id": ObjectId(item_id)})
+                if item is not None:
+                    self._notify("item_saved", item)
             return result
         except Exception as e:
             self.logger.error(f"Error updating item: {e}")
             raise
+
+
+register_cache(ItemDBManager.item_cache)
+metrics.registry.register(metrics.CallbackMetric(
+    "item_cache_coalesced_total", "Item cache misses served by a query another request already started.",
+    lambda: ItemDBManager.item_loads.coalesced, kind="counter"))
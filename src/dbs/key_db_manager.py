@@ -1,26 +1,60 @@
 # src/dbs/key_db_manager.py
 
+import copy
 from src.dbs.base_db_manager import BaseDBManager
+from src.helpers.metrics import track_db_operation, register_cache
 from datetime import datetime
 
 from datetime import datetime
 from src.dbs.base_db_manager import BaseDBManager
+from pymongo import IndexModel, ASCENDING, ReturnDocument
+from src.configs.config import CurrentConfig
+from src.utils.cache import TTLCache
+from src.utils.security import token_fingerprint
 
 class KeyDBManager(BaseDBManager):
     """
     Manages key-related operations in the database.
+
+    Refresh tokens are stored as fixed-size fingerprints (see
+    `token_fingerprint`), never as full JWT strings, and the signing key is
+    referenced by its key id (`kid`) instead of being copied into every
+    document. Callers keep passing full tokens; hashing happens here.
+
+    `keys` documents read by the authentication path are cached in-process per
+    user_id. Writes through this manager invalidate the local entry; other
+    worker processes pick up changes once their entry expires
+    (KEY_CACHE_TTL_SECONDS).
     """
+
+    indexes = {
+        "keys": [
+            IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+            # Multikey index backing refresh-token reuse detection
+            IndexModel([("refresh_tokens_used", ASCENDING)], name="refresh_tokens_used"),
+            # Key documents not refreshed within a refresh-token lifetime are useless
+            IndexModel([("updated_at", ASCENDING)], name="updated_at_ttl",
+                       expireAfterSeconds=CurrentConfig.REFRESH_TOKEN_EXPIRE_MINUTES * 60),
+        ],
+    }
+
+    # Maximum number of used refresh tokens remembered per user
+    MAX_USED_REFRESH_TOKENS = 10
+
+    key_cache = TTLCache(maxsize=CurrentConfig.KEY_CACHE_MAX_SIZE,
+                         ttl=CurrentConfig.KEY_CACHE_TTL_SECONDS,
+                         name="key_information",
+                         copier=copy.deepcopy)
     
-    async def save_key_information(self, user_id: str, refresh_token: str,
-                                    public_key: str = None, private_key: str = None) -> bool:
+    @track_db_operation
+    async def save_key_information(self, user_id: str, refresh_token: str, kid: str = None) -> bool:
         """
         Updates or inserts key information for a given user, maintaining a bounded list of used refresh tokens.
 
         Parameters:
         - user_id (str): The unique identifier for the user.
         - refresh_token (str): The most recently issued refresh token.
-        - public_key (str, optional): The user's public key.
-        - private_key (str, optional): The user's private key.
+        - kid (str, optional): Id of the key the user's tokens are signed with.
 
         Returns:
         - bool: True if the operation is successful, False otherwise.
@@ -29,29 +63,47 @@ class KeyDBManager(BaseDBManager):
             db = await self.get_db()
             result = await db.keys.update_one(
                 {"user_id": user_id},
-                {"$set": {
-                    "refresh_token": refresh_token,
-                    "public_key": public_key,
-                    "private_key": private_key,
-                    "updated_at": datetime.utcnow()
-                }},
+                {
+                    "$set": {
+                        "refresh_token": token_fingerprint(refresh_token),
+                        "kid": kid,
+                        "updated_at": datetime.utcnow()
+                    },
+                    # Documents written before key ids carried full PEM copies
+                    "$unset": {"public_key": "", "private_key": ""}
+                },
                 upsert=True
             )
+            self.key_cache.invalidate(user_id)
             return result.acknowledged
         except Exception as e:
             self.logger.error(f"Error saving key information for user {user_id}: {e}")
             return False
 
-    async def find_key_information(self, user_id: str):
+    async def find_key_information(self, user_id: str, use_cache: bool = True):
         """
         Retrieves key information for a specific user.
 
         Parameters:
         - user_id (str): The unique identifier for the user.
+        - use_cache (bool): Serve from the in-process cache when possible. Pass False
+          where a stale read is unacceptable (e.g. refresh-token reuse detection).
 
         Returns:
         - dict: The key information if found, None otherwise.
         """
+        if use_cache:
+            key_info = self.key_cache.get(user_id)
+            if key_info is not None:
+                return key_info
+        key_info = await self._fetch_key_information(user_id)
+        if key_info is not None:
+            self.key_cache.set(user_id, key_info)
+        return key_info
+
+    @track_db_operation
+    async def _fetch_key_information(self, user_id: str):
+        """Reads the `keys` document of a user from MongoDB, bypassing the cache."""
         try:
             db = await self.get_db()
             # Ensure to match the user_id as a string, as stored in the database
@@ -61,6 +113,7 @@ class KeyDBManager(BaseDBManager):
             self.logger.error(f"Error retrieving key information for user {user_id}: {e}")
             return None
         
+    @track_db_operation
     async def delete_refresh_token(self, user_id: str, refresh_token: str) -> bool:
         """
         Deletes the user's record based on user_id.
@@ -76,11 +129,13 @@ class KeyDBManager(BaseDBManager):
             db = await self.get_db()
             # Delete the user's record from the database
             result = await db.keys.delete_one({"user_id": user_id})
+            self.key_cache.invalidate(user_id)
             return result.deleted_count > 0
         except Exception as e:
             self.logger.error(f"Error deleting user record for user {user_id}: {e}")
             return False
     
+    @track_db_operation
     async def add_refresh_token_to_list(self, user_id: str, refresh_token: str) -> bool:
         """
         Adds a refresh token to the refresh_tokens_used list for a specific user, ensuring the list does not exceed a predefined limit.
@@ -94,8 +149,7 @@ class KeyDBManager(BaseDBManager):
         """
         try:
             db = await self.get_db()
-            # Define the maximum number of refresh tokens to store
-            max_tokens_stored = 10
+            max_tokens_stored = self.MAX_USED_REFRESH_TOKENS
 
             # Use MongoDB's $addToSet and $slice to efficiently manage the list size and uniqueness
             result = await db.keys.update_one(
@@ -103,17 +157,63 @@ class KeyDBManager(BaseDBManager):
                 {
                     "$push": {
                         "refresh_tokens_used": {
-                            "$each": [refresh_token],
+                            "$each": [token_fingerprint(refresh_token)],
                             "$slice": -max_tokens_stored
                         }
                     }
                 }
             )
+            self.key_cache.invalidate(user_id)
             return result.modified_count > 0
         except Exception as e:
             self.logger.error(f"Error adding refresh token for user {user_id}: {e}")
             return False
     
+    @track_db_operation
+    async def rotate_refresh_token(self, user_id: str, refresh_token: str, new_refresh_token: str) -> bool:
+        """
+        Atomically retires the presented refresh token and installs its replacement.
+
+        The update only matches while `refresh_token` is still the user's current,
+        unused token, so of several concurrent refreshes with the same token exactly
+        one succeeds; the others (and any later replay) get False.
+
+        Parameters:
+        - user_id (str): The unique identifier for the user.
+        - refresh_token (str): The refresh token presented by the client.
+        - new_refresh_token (str): The refresh token issued in its place.
+
+        Returns:
+        - bool: True if the token was rotated, False if it was not the current token.
+        """
+        fingerprint = token_fingerprint(refresh_token)
+        try:
+            db = await self.get_db()
+            result = await db.keys.find_one_and_update(
+                {
+                    "user_id": user_id,
+                    "refresh_token": fingerprint,
+                    "refresh_tokens_used": {"$ne": fingerprint},
+                },
+                {
+                    "$set": {"refresh_token": token_fingerprint(new_refresh_token), "updated_at": datetime.utcnow()},
+                    "$push": {
+                        "refresh_tokens_used": {
+                            "$each": [fingerprint],
+                            "$slice": -self.MAX_USED_REFRESH_TOKENS
+                        }
+                    }
+                },
+                projection={"_id": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            self.key_cache.invalidate(user_id)
+            return result is not None
+        except Exception as e:
+            self.logger.error(f"Error rotating refresh token for user {user_id}: {e}")
+            raise
+
+    @track_db_operation
     async def find_by_refresh_token_used(self, refresh_token: str):
         """
         Finds a key record based on a refresh token used.
@@ -126,8 +226,11 @@ class KeyDBManager(BaseDBManager):
         """
         try:
             db = await self.get_db()
-            key_record = await db.keys.find_one({"refresh_tokens_used": refresh_token})
+            key_record = await db.keys.find_one({"refresh_tokens_used": token_fingerprint(refresh_token)})
             return key_record
         except Exception as e:
-            self.logger.error(f"Error finding key record by refresh token {refresh_token}: {e}")
-            return None
\ No newline at end of file
+            self.logger.error(f"Error finding key record by refresh token: {e}")
+            return None
+
+
+register_cache(KeyDBManager.key_cache)
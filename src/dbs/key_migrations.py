@@ -0,0 +1,82 @@
+# src/dbs/key_migrations.py
+
+import asyncio
+from pymongo import UpdateOne
+from src.helpers.log_config import setup_logger
+from src.utils.security import token_fingerprint
+from src.utils.key_ring import key_ring
+
+logger = setup_logger()
+
+# Documents written before fingerprints and key ids were introduced
+LEGACY_KEY_FILTER = {
+    "$or": [
+        {"public_key": {"$exists": True}},
+        {"private_key": {"$exists": True}},
+        {"refresh_token": {"$type": "string"}},
+        {"refresh_tokens_used": {"$type": "string"}},
+    ]
+}
+
+
+def _fingerprint_if_token(value):
+    return token_fingerprint(value) if isinstance(value, str) else value
+
+
+async def migrate_key_documents(db, kid: str, batch_size: int = 500) -> int:
+    """
+    Rewrites legacy `keys` documents in place. Full refresh-token strings
+    become fingerprints, and the per-user PEM copies are replaced by a
+    reference to the signing key id. Safe to run repeatedly; migrated
+    documents no longer match the legacy filter.
+
+    Parameters:
+        db: The Motor database.
+        kid: Key id to record on migrated documents.
+        batch_size: Number of updates sent per bulk_write.
+
+    Returns:
+        int: The number of documents modified.
+    """
+    modified = 0
+    operations = []
+    cursor = db.keys.find(LEGACY_KEY_FILTER,
+                          {"refresh_token": 1, "refresh_tokens_used": 1},
+                          batch_size=batch_size)
+    async for document in cursor:
+        operations.append(UpdateOne(
+            {"_id": document["_id"]},
+            {
+                "$set": {
+                    "refresh_token": _fingerprint_if_token(document.get("refresh_token")),
+                    "refresh_tokens_used": [_fingerprint_if_token(token)
+                                            for token in document.get("refresh_tokens_used", [])],
+                    "kid": kid,
+                },
+                "$unset": {"public_key": "", "private_key": ""},
+            }
+        ))
+        if len(operations) >= batch_size:
+            result = await db.keys.bulk_write(operations, ordered=False)
+            modified += result.modified_count
+            operations = []
+    if operations:
+        result = await db.keys.bulk_write(operations, ordered=False)
+        modified += result.modified_count
+    logger.info(f"Migrated {modified} key documents to token fingerprints and kid {kid}")
+    return modified
+
+
+async def _main():
+    from src.dbs.init_mongodb import Database
+
+    database = Database()
+    db = await database.get_db()
+    modified = await migrate_key_documents(db, key_ring.material.kid)
+    print(f"Migrated {modified} key documents")
+    await database.disconnect()
+
+
+if __name__ == "__main__":
+    # python -m src.dbs.key_migrations
+    asyncio.run(_main())
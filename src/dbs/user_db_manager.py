@@ -2,51 +2,116 @@
 
 from typing import Optional
 from src.dbs.base_db_manager import BaseDBManager
+from src.helpers.metrics import track_db_operation
 from pymongo.results import InsertOneResult, DeleteResult, UpdateResult
 from datetime import datetime
 from bson import ObjectId
+from pymongo import IndexModel, ASCENDING
+from src.models.user_models import UserAuthRecord
+from src.configs.config import CurrentConfig
+from src.utils.cache import TTLCache
+from src.helpers.metrics import register_cache
 
 class UserDBManager(BaseDBManager):
     """
     Manages database operations related to users using Motor for asynchronous access.
     """
 
-    async def find_user_by_id(self, user_id: str) -> Optional[dict]:
+    indexes = {
+        "users": [
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        ],
+    }
+
+    # Optional cache of id/role records used by token refresh
+    role_cache = TTLCache(maxsize=CurrentConfig.USER_ROLE_CACHE_MAX_SIZE,
+                          ttl=CurrentConfig.USER_ROLE_CACHE_TTL_SECONDS,
+                          name="user_roles")
+
+    # Projections used by the authentication paths
+    AUTH_PROJECTION = {"role": 1, "password": 1}
+    ROLE_PROJECTION = {"role": 1}
+
+    @track_db_operation
+    async def find_user_by_id(self, user_id: str, projection: Optional[dict] = None) -> Optional[dict]:
         """
         Finds a user document by its ObjectId asynchronously.
 
         Parameters:
             user_id: The string representation of the user's ObjectId.
+            projection: Optional MongoDB projection limiting the returned fields.
 
         Returns:
             The user document if found, None otherwise.
         """
         try:
             db_instance = await self.get_db()
-            user = await db_instance["users"].find_one({"_id": ObjectId(user_id)})
+            user = await db_instance["users"].find_one({"_id": ObjectId(user_id)}, projection)
             return user
         except Exception as e:
             self.logger.error(f"Error finding a user by ID: {e}")
             raise
 
-    async def find_user_by_email(self, email: str) -> Optional[dict]:
+    @track_db_operation
+    async def find_user_by_email(self, email: str, projection: Optional[dict] = None) -> Optional[dict]:
         """
         Finds a user document by email asynchronously.
 
         Parameters:
             email: The email address to search for.
+            projection: Optional MongoDB projection limiting the returned fields.
 
         Returns:
             The user document if found, None otherwise.
         """
         try:
             db_instance = await self.get_db()
-            user = await db_instance["users"].find_one({"email": email})
+            user = await db_instance["users"].find_one({"email": email}, projection)
             return user
         except Exception as e:
             self.logger.error(f"Error finding a user by email: {e}")
             raise
 
+    async def find_user_auth_by_email(self, email: str) -> Optional[UserAuthRecord]:
+        """
+        Finds the id, role and password hash of a user by email, without
+        fetching the rest of the user document.
+
+        Parameters:
+            email: The email address to search for.
+
+        Returns:
+            A UserAuthRecord if found, None otherwise.
+        """
+        user = await self.find_user_by_email(email, self.AUTH_PROJECTION)
+        if user is None:
+            return None
+        return UserAuthRecord(str(user["_id"]), user.get("role"), user.get("password"))
+
+    async def find_user_auth_by_id(self, user_id: str, use_cache: bool = False) -> Optional[UserAuthRecord]:
+        """
+        Finds the id and role of a user by ObjectId, without fetching the
+        rest of the user document.
+
+        Parameters:
+            user_id: The string representation of the user's ObjectId.
+            use_cache: Serve the record from the in-process role cache when possible.
+
+        Returns:
+            A UserAuthRecord (without password) if found, None otherwise.
+        """
+        if use_cache:
+            record = self.role_cache.get(user_id)
+            if record is not None:
+                return record
+        user = await self.find_user_by_id(user_id, self.ROLE_PROJECTION)
+        if user is None:
+            return None
+        record = UserAuthRecord(str(user["_id"]), user.get("role"))
+        self.role_cache.set(user_id, record)
+        return record
+
+    @track_db_operation
     async def insert_user(self, user_data: dict) -> InsertOneResult:
         """
         Inserts a new user document asynchronously.
@@ -65,6 +130,7 @@ class UserDBManager(BaseDBManager):
             self.logger.error(f"Error inserting a user: {e}")
             raise
 
+    @track_db_operation
     async def delete_user_by_email(self, email: str) -> DeleteResult:
         """
         Deletes a user document by email.
@@ -81,11 +147,14 @@ class UserDBManager(BaseDBManager):
         try:
             db_instance = await self.get_db()
             result = await db_instance["users"].delete_one({"email": email})
+            # The cache is keyed by id, which is unknown here
+            self.role_cache.clear()
             return result
         except Exception as e:
             self.logger.error(f"Error deleting user by email: {e}")
             raise
 
+    @track_db_operation
     async def update_user(self, email: str, update_data: dict) -> UpdateResult:
         """
         Updates a user document.
@@ -103,11 +172,15 @@ class UserDBManager(BaseDBManager):
         try:
             db_instance = await self.get_db()
             result = await db_instance["users"].update_one({"email": email}, {'$set': update_data})
+            if "role" in update_data:
+                # The cache is keyed by id, which is unknown here
+                self.role_cache.clear()
             return result
         except Exception as e:
             self.logger.error(f"Error updating user: {e}")
             raise
 
+    @track_db_operation
     async def update_user_password(self, email: str, hashed_password: str) -> UpdateResult:
         """
         Updates a user's password and refreshes the 'updated_at' timestamp.
@@ -134,4 +207,7 @@ class UserDBManager(BaseDBManager):
             self.logger.error(f"Error updating user password: {e}")
             raise
 
-    
\ No newline at end of file
+    
+
+
+register_cache(UserDBManager.role_cache)
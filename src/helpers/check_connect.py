@@ -2,65 +2,237 @@
 
 import logging
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
+import gc
+import time
+from collections import deque
+from typing import Optional
 from pymongo.errors import OperationFailure
 import psutil  # Import psutil for system monitoring
 from src.helpers.log_config import setup_logger
+from src.helpers import metrics
 from src.configs.config import CurrentConfig  # Import CurrentConfig for centralized configuration
 
 # Define a constant for the monitoring interval
 MONITOR_INTERVAL_SECONDS = 20
+# Number of samples kept in memory (one hour at the default interval)
+RESOURCE_HISTORY_SIZE = 180
+# How often the event-loop lag probe wakes up
+LOOP_LAG_PROBE_INTERVAL_SECONDS = 0.5
 
-# Use the CurrentConfig for MongoDB URI and Pool Size
-URI = CurrentConfig.MONGO_CONNECTION_STRING
+# Use the CurrentConfig for the Pool Size
 MAX_POOL_SIZE = CurrentConfig.POOL_SIZE
 
 logger = setup_logger()
 
-async def count_connections(uri):
+# Figures from the most recent serverStatus sample, read by the rest of the app
+latest_mongo_stats: dict = {}
+
+def get_mongo_stats() -> dict:
     """
-    Asynchronously count and log the number of active connections to MongoDB.
-    
-    :param uri: MongoDB URI string
+    Return the MongoDB connection, pool and opcounter figures from the latest sample.
+    """
+    return latest_mongo_stats
+
+async def collect_mongo_stats(client) -> Optional[dict]:
+    """
+    Run `serverStatus` once on the shared client and extract connection,
+    pool and opcounter figures.
+
+    :param client: The application's AsyncIOMotorClient
+    :return: The collected figures, or None if the command failed
     """
-    client = None  # Initialize client outside of try block
     try:
-        client = AsyncIOMotorClient(uri)
         server_status = await client.admin.command("serverStatus")
-        connections = server_status['connections']['current']
-        logger.info(f"Current MongoDB connections: {connections}")
     except OperationFailure as e:
         logger.error(f"MongoDB operation failed: {e}")
+        return None
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-    finally:
-        if client:
-            client.close()  # Explicitly close the client without awaiting
+        return None
+
+    connections = server_status.get('connections', {})
+    stats = {
+        "connections": {
+            "current": connections.get('current'),
+            "available": connections.get('available'),
+            "total_created": connections.get('totalCreated'),
+            "active": connections.get('active'),
+        },
+        "pool": {
+            "max_pool_size": client.options.pool_options.max_pool_size,
+            "min_pool_size": client.options.pool_options.min_pool_size,
+        },
+        "opcounters": dict(server_status.get('opcounters', {})),
+        "sampled_at": time.time(),
+    }
+    latest_mongo_stats.clear()
+    latest_mongo_stats.update(stats)
+    return stats
+
+async def count_connections(client) -> Optional[int]:
+    """
+    Asynchronously count and log the number of active connections to MongoDB.
+    
+    :param client: The application's AsyncIOMotorClient
+    :return: The current number of connections, or None if it could not be read
+    """
+    stats = await collect_mongo_stats(client)
+    if stats is None:
+        return None
+    connections = stats["connections"]["current"]
+    logger.info(f"Current MongoDB connections: {connections}")
+    return connections
+
+
+class GCPauseTracker:
+    """
+    Measures garbage-collector pauses through `gc.callbacks` and reports
+    the collections seen since the previous drain.
+    """
+
+    def __init__(self):
+        self._started_at = None
+        self._installed = False
+        self._reset()
+
+    def _reset(self):
+        self.collections = 0
+        self.total_pause = 0.0
+        self.max_pause = 0.0
+
+    def install(self):
+        if not self._installed:
+            gc.callbacks.append(self._callback)
+            self._installed = True
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._started_at = time.perf_counter()
+        elif self._started_at is not None:
+            pause = time.perf_counter() - self._started_at
+            self._started_at = None
+            self.collections += 1
+            self.total_pause += pause
+            self.max_pause = max(self.max_pause, pause)
+
+    def drain(self) -> dict:
+        stats = {
+            "collections": self.collections,
+            "total_pause_ms": round(self.total_pause * 1000, 3),
+            "max_pause_ms": round(self.max_pause * 1000, 3),
+        }
+        self._reset()
+        return stats
 
 
-async def monitor_system_resources(uri=URI, interval=MONITOR_INTERVAL_SECONDS):
+class LoopLagProbe:
+    """
+    Measures event-loop lag as the extra time a short sleep takes to wake up.
+    """
+
+    def __init__(self, interval=LOOP_LAG_PROBE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - started_at - self.interval)
+            self.max_lag = max(self.max_lag, self.last_lag)
+
+    def drain(self) -> dict:
+        stats = {
+            "last_ms": round(self.last_lag * 1000, 3),
+            "max_ms": round(self.max_lag * 1000, 3),
+        }
+        self.max_lag = 0.0
+        return stats
+
+
+gc_pause_tracker = GCPauseTracker()
+loop_lag_probe = LoopLagProbe()
+
+metrics.registry.register(metrics.CallbackMetric(
+    "event_loop_lag_seconds", "Extra wake-up delay of the event-loop lag probe.",
+    lambda: loop_lag_probe.last_lag))
+metrics.registry.register(metrics.CallbackMetric(
+    "mongodb_connections", "Current MongoDB server connections from the latest serverStatus.",
+    lambda: latest_mongo_stats.get("connections", {}).get("current")))
+
+# Recent resource samples, newest last, served by the internal monitoring endpoint
+resource_history = deque(maxlen=RESOURCE_HISTORY_SIZE)
+
+def get_resource_history() -> list:
+    """
+    Return the in-memory resource samples, oldest first.
+    """
+    return list(resource_history)
+
+def sample_system_resources(process: psutil.Process) -> dict:
+    """
+    Take one non-blocking resource sample. CPU figures are deltas since the
+    previous call, so nothing here sleeps.
+
+    :param process: The psutil handle of the current process
+    :return: The sample
+    """
+    with process.oneshot():
+        memory_info = process.memory_info()
+        try:
+            open_fds = process.num_fds()
+        except (AttributeError, psutil.Error):  # num_fds is POSIX-only
+            open_fds = None
+        sample = {
+            "timestamp": time.time(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "process": {
+                "cpu_percent": process.cpu_percent(interval=None),
+                "rss_bytes": memory_info.rss,
+                "open_fds": open_fds,
+                "threads": process.num_threads(),
+            },
+        }
+    sample["event_loop_lag"] = loop_lag_probe.drain()
+    sample["gc"] = gc_pause_tracker.drain()
+    return sample
+
+
+async def monitor_system_resources(database, interval=MONITOR_INTERVAL_SECONDS):
     """
     Monitor system resources (CPU and Memory usage) and MongoDB connections every `interval` seconds.
     
-    :param uri: MongoDB URI string
+    :param database: The shared Database instance whose client is used for serverStatus
     :param interval: Interval in seconds between checks
     """
+    process = psutil.Process()
+    # Prime the CPU counters; later calls report usage since the previous one without blocking
+    psutil.cpu_percent(interval=None)
+    process.cpu_percent(interval=None)
+    gc_pause_tracker.install()
+
     while True:
+        await asyncio.sleep(interval)
+
         # Check system resources
-        cpu_usage = psutil.cpu_percent(interval=1)  # Ensure fresh CPU usage info
-        memory_usage = psutil.virtual_memory().percent
+        sample = sample_system_resources(process)
+        cpu_usage = sample["cpu_percent"]
+        memory_usage = sample["memory_percent"]
         if cpu_usage > 90 or memory_usage > 90:
             logger.warning(f"System overload detected! CPU: {cpu_usage}%, Memory: {memory_usage}%")
         else:
             logger.info(f"System resources within normal parameters. CPU: {cpu_usage}%, Memory: {memory_usage}%")
-        
-        # Now check MongoDB connections within the same loop
-        connections = await count_connections(uri)
+    
+        # Now check MongoDB connections within the same loop, reusing the application's client
+        client = await database.get_client()
+        connections = await count_connections(client) if client is not None else None
+        sample["mongo_connections"] = connections
+        resource_history.append(sample)
         if connections is not None:  # Only log if count_connections succeeded
             if connections < MAX_POOL_SIZE:
                 logger.info(f"Monitored MongoDB connections: {connections}")    
             else:
                 logger.critical(f"Number of connections ({connections}) exceeds max pool size ({MAX_POOL_SIZE}). Consider increasing the pool size or implementing connection throttling.")
-            
-        await asyncio.sleep(interval)  # Sleep at the end of the loop for the specified interval
-
@@ -0,0 +1,205 @@
+# src/helpers/compression.py
+
+import hashlib
+import zlib
+from functools import lru_cache
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from src.configs.config import CurrentConfig
+from src.helpers import metrics
+from src.utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip
+    brotli = None
+
+# Content types that are already compressed (or not worth compressing)
+EXCLUDED_CONTENT_TYPES = tuple(
+    content_type.strip().lower()
+    for content_type in CurrentConfig.COMPRESSION_EXCLUDED_TYPES.split(",")
+    if content_type.strip()
+)
+# GET responses under these path prefixes are idempotent enough to cache compressed
+CACHED_PATH_PREFIXES = tuple(
+    prefix.strip() for prefix in CurrentConfig.COMPRESSION_CACHE_PATHS.split(",") if prefix.strip()
+)
+
+# Compressed bodies keyed by (encoding, digest of the uncompressed body), so a
+# repeated catalog response is compressed once and served from memory afterwards.
+compressed_body_cache = TTLCache(maxsize=CurrentConfig.COMPRESSION_CACHE_SIZE,
+                                 ttl=CurrentConfig.COMPRESSION_CACHE_TTL_SECONDS,
+                                 name="compressed_bodies",
+                                 max_weight=CurrentConfig.COMPRESSION_CACHE_MAX_BYTES,
+                                 weigher=len)
+metrics.register_cache(compressed_body_cache)
+
+COMPRESSED_RESPONSES = metrics.registry.register(metrics.Counter(
+    "http_compressed_responses_total", "Responses compressed by the compression middleware, by encoding.",
+    ("encoding",)))
+
+
+@lru_cache(maxsize=128)
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Picks "br" or "gzip" from an Accept-Encoding header, honouring q-values
+    and preferring Brotli on ties. Clients send few distinct headers, so the
+    parsed result is memoized.
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = []
+    if brotli is not None:
+        candidates.append(("br", weights.get("br", wildcard)))
+    if CurrentConfig.COMPRESSION_GZIP_FALLBACK or brotli is None:
+        candidates.append(("gzip", weights.get("gzip", wildcard)))
+    best = max(candidates, key=lambda candidate: candidate[1], default=(None, 0.0))
+    return best[0] if best[1] > 0 else None
+
+
+def _new_compressor(encoding: str):
+    if encoding == "br":
+        return brotli.Compressor(mode=brotli.MODE_TEXT, quality=CurrentConfig.COMPRESSION_BROTLI_QUALITY)
+    # wbits=31 writes the gzip container around the deflate stream
+    return zlib.compressobj(CurrentConfig.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compresses a complete body with the given encoding ("br" or "gzip")."""
+    if encoding == "br":
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=CurrentConfig.COMPRESSION_BROTLI_QUALITY)
+    compressor = _new_compressor(encoding)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with Brotli, or gzip as a fallback.
+
+    - Bodies smaller than COMPRESSION_MIN_SIZE are sent as is; for small JSON
+      responses compression costs more CPU than it saves bandwidth.
+    - Already-compressed content types (COMPRESSION_EXCLUDED_TYPES) and
+      responses that already carry a Content-Encoding are passed through.
+    - Streaming responses are compressed chunk by chunk and flushed per chunk.
+    - Compressed GET responses under COMPRESSION_CACHE_PATHS are cached by a
+      digest of their uncompressed body, so identical catalog pages are only
+      compressed once.
+    """
+
+    def __init__(self, app, minimum_size: int = CurrentConfig.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        cacheable = scope["method"] == "GET" and scope["path"].startswith(CACHED_PATH_PREFIXES)
+        await _CompressionResponder(self.app, encoding, self.minimum_size, cacheable)(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Per-request state of CompressionMiddleware."""
+
+    def __init__(self, app, encoding: str, minimum_size: int, cacheable: bool):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cacheable = cacheable
+        self.send = None
+        self.start_message = None
+        self.passthrough = False
+        self.started = False
+        self.compressor = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _should_compress(self, message) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message.get("headers", []))
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+    def _compress_whole(self, body: bytes) -> bytes:
+        if not self.cacheable:
+            return compress(body, self.encoding)
+        cache_key = (self.encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = compressed_body_cache.get(cache_key)
+        if compressed is None:
+            compressed = compress(body, self.encoding)
+            compressed_body_cache.set(cache_key, compressed)
+        return compressed
+
+    def _start_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+
+    async def send_compressed(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk shows the body size
+            self.start_message = message
+            self.passthrough = not self._should_compress(message)
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            if not self.started and self.start_message is not None:
+                self.started = True
+                await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if not more_body:
+                if len(body) < self.minimum_size:
+                    await self.send(self.start_message)
+                    await self.send(message)
+                    return
+                body = self._compress_whole(body)
+                headers = self._start_headers()
+                headers["Content-Length"] = str(len(body))
+                COMPRESSED_RESPONSES.inc(self.encoding)
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            # Streaming response: compress incrementally, flushing every chunk
+            headers = self._start_headers()
+            del headers["Content-Length"]
+            self.compressor = _new_compressor(self.encoding)
+            COMPRESSED_RESPONSES.inc(self.encoding)
+            await self.send(self.start_message)
+
+        await self.send({"type": "http.response.body",
+                         "body": self._compress_chunk(body, more_body),
+                         "more_body": more_body})
+
+    def _compress_chunk(self, body: bytes, more_body: bool) -> bytes:
+        if self.encoding == "br":
+            data = self.compressor.process(body)
+            return data + (self.compressor.flush() if more_body else self.compressor.finish())
+        data = self.compressor.compress(body)
+        return data + self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
@@ -1,18 +1,24 @@
 # src/helpers/log_config.py
 
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler
 import os
 import logging
+import queue
+import sys
+import threading
+import traceback
+import atexit
+import json
+import random
 from typing import Optional
 import gzip
 import shutil
 from datetime import datetime, timedelta
 import time
 import asyncio
-from fastapi import Request, HTTPException, Response
 from fastapi.responses import JSONResponse
-from starlette.responses import StreamingResponse
-from typing import Callable
+from src.configs.config import CurrentConfig
+from src.helpers import metrics
 
 APP_NAME = 'python-dev'
 MAX_RESPONSE_BODY_LOG_LENGTH = 1024
@@ -20,6 +26,7 @@ MAX_RESPONSE_BODY_LOG_LENGTH = 1024
 # Global flag to prevent reinitialization of logger
 logger_initialized = False
 global_logger = None  # Define a global variable for the logger instance
+global_log_listener = None  # Background thread writing queued records to disk
 
 # Define a list of paths to exclude from detailed logging
 EXCLUDED_PATHS = [
@@ -29,17 +36,58 @@ EXCLUDED_PATHS = [
     # Add more paths as needed
 ]
 
+# Response bodies are only captured for these paths (route templates or raw paths)
+BODY_LOG_PATHS = [
+    # e.g. "/api/v1/users/signup"
+]
+
+# Fraction of access-log lines kept per status class
+ACCESS_LOG_SAMPLE_RATES = {
+    2: CurrentConfig.ACCESS_LOG_SAMPLE_2XX,
+    3: CurrentConfig.ACCESS_LOG_SAMPLE_3XX,
+    4: CurrentConfig.ACCESS_LOG_SAMPLE_4XX,
+    5: CurrentConfig.ACCESS_LOG_SAMPLE_5XX,
+}
+
 def should_log(request_path: str) -> bool:
     """
-    Determine if the request path is eligible for detailed logging.
+    Determine if the response body of the request path should be captured
+    in the access log. Capture is opt-in through BODY_LOG_PATHS and never
+    happens for EXCLUDED_PATHS.
 
     Args:
-        request_path (str): The path of the incoming request.
+        request_path (str): The route template or path of the incoming request.
 
     Returns:
         bool: True if the request should be logged in detail, False otherwise.
     """
-    return request_path not in EXCLUDED_PATHS
+    return request_path in BODY_LOG_PATHS and request_path not in EXCLUDED_PATHS
+
+def should_sample(status_code: Optional[int]) -> bool:
+    """
+    Decide whether the access-log line of a response is kept, according to
+    the sampling rate of its status class.
+
+    Args:
+        status_code (Optional[int]): The response status code.
+
+    Returns:
+        bool: True if the line should be written, False otherwise.
+    """
+    rate = ACCESS_LOG_SAMPLE_RATES.get((status_code or 500) // 100, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
+class AccessLogFormatter(logging.Formatter):
+    """
+    Formatter that writes structured access-log records as bare JSON lines
+    and everything else with the regular format.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "json_line", False):
+            return record.getMessage()
+        return super().format(record)
 
 
 class CustomRotatingFileHandler(RotatingFileHandler):
@@ -57,6 +105,8 @@ class CustomRotatingFileHandler(RotatingFileHandler):
         """
         self.dir_name = dir_name
         self.app_name = app_name
+        # When True, per-record flushes are skipped and the owner calls flush_batch()
+        self.batch_flush = False
         super().__init__(self.get_new_logfile_name(), mode, max_bytes, backup_count, encoding, delay)
 
     def get_new_logfile_name(self):
@@ -72,6 +122,19 @@ class CustomRotatingFileHandler(RotatingFileHandler):
         next_count = max(log_counts) + 1 if log_counts else 1
         return os.path.join(self.dir_name, f"{self.app_name}-{today}-{next_count}.log")
 
+    def flush(self):
+        """
+        Flush the stream unless records are being written in batches.
+        """
+        if not self.batch_flush:
+            super().flush()
+
+    def flush_batch(self):
+        """
+        Flush the stream once at the end of a batch of records.
+        """
+        super().flush()
+
     def shouldRollover(self, record):
         """
         Determine if rollover should occur based on file size.
@@ -121,14 +184,104 @@ class GZipRotator:
         os.remove(source)
 
 
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler that never lets a full log queue stall the caller indefinitely.
+
+    With the "drop" policy records are discarded as soon as the queue is full;
+    with the "block" policy the caller waits up to `block_timeout` seconds
+    before the record is discarded. Discarded records are counted in `dropped`.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop", block_timeout: float = 0.1):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """
+    Background thread that drains the log queue in batches and writes the
+    records to the target handlers, flushing each handler once per batch.
+    File I/O and gzip rotation therefore happen off the event loop.
+    """
+
+    _sentinel = None
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = 256):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = max(1, batch_size)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the listener thread."""
+        for handler in self.handlers:
+            if hasattr(handler, "batch_flush"):
+                handler.batch_flush = True
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the listener to write out what is queued and wait for it to finish."""
+        if self._thread is not None:
+            self.queue.put(self._sentinel)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        try:
+                            handler.handle(record)
+                        except Exception:
+                            # One failing handler or formatter must not kill the listener thread
+                            handler.handleError(record)
+            for handler in self.handlers:
+                try:
+                    if hasattr(handler, "flush_batch"):
+                        handler.flush_batch()
+                    else:
+                        handler.flush()
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+            if stop:
+                return
+
+
 def setup_logger() -> logging.Logger:
     """
-    Set up and configure the logger with a custom rotating file handler and gzip rotator.
+    Set up and configure the logger. Records are put on a bounded queue and
+    written by a background thread to a custom rotating file handler with a
+    gzip rotator.
 
     Returns:
         logging.Logger: The configured logger.
     """
-    global global_logger
+    global global_logger, global_log_listener
     if global_logger is None:
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.INFO)
@@ -139,69 +292,180 @@ def setup_logger() -> logging.Logger:
         handler = CustomRotatingFileHandler(app_name=APP_NAME, dir_name=logs_dir, max_bytes=0, backup_count=3, encoding='utf-8')
         handler.rotator = GZipRotator()
         handler.namer = lambda name: name.replace(".log", "") + ".gz"
-        formatter = logging.Formatter('%(asctime)s %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+        formatter = AccessLogFormatter('%(asctime)s %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+
+        log_queue = queue.Queue(maxsize=CurrentConfig.LOG_QUEUE_SIZE)
+        logger.addHandler(BoundedQueueHandler(log_queue, policy=CurrentConfig.LOG_QUEUE_POLICY))
+        global_log_listener = BatchingQueueListener(log_queue, handler, batch_size=CurrentConfig.LOG_BATCH_SIZE)
+        global_log_listener.start()
+        atexit.register(stop_log_listener)
+        # Threads do not survive fork(); give each forked worker its own writer
+        os.register_at_fork(after_in_child=_restart_log_listener)
 
         global_logger = logger  # Store the configured logger in the global variable
 
     return global_logger
 
 
-async def log_requests(request: Request, call_next):
+def stop_log_listener():
+    """
+    Flush queued log records to disk and stop the background writer thread.
     """
-    Middleware function to log incoming requests and their processing time.
+    if global_log_listener is not None:
+        global_log_listener.stop()
 
-    Args:
-        request (Request): The incoming request.
-        call_next: Function to proceed with request handling.
 
-    Returns:
-        Response: The response object to be sent back to the client.
+def _restart_log_listener():
+    # The inherited queue may hold the parent's records or a lock taken by the
+    # parent's writer thread, so the child starts over with an empty one.
+    if global_log_listener is not None:
+        log_queue = queue.Queue(maxsize=CurrentConfig.LOG_QUEUE_SIZE)
+        for handler in global_logger.handlers:
+            if isinstance(handler, BoundedQueueHandler):
+                handler.queue = log_queue
+        global_log_listener.queue = log_queue
+        global_log_listener._thread = None
+        global_log_listener.start()
+
+
+def _log_queue_stat(key: str):
+    return lambda: get_log_queue_stats()[key]
+
+
+metrics.registry.register(metrics.CallbackMetric(
+    "log_queue_depth", "Log records waiting for the background writer.", _log_queue_stat("queued")))
+metrics.registry.register(metrics.CallbackMetric(
+    "log_records_dropped_total", "Log records dropped because the log queue was full.",
+    _log_queue_stat("dropped"), kind="counter"))
+
+
+def get_log_queue_stats() -> dict:
+    """
+    Returns the current depth of the log queue and the number of dropped records.
     """
-    logger = setup_logger()
-    start_time = time.time()
+    queue_handler = next((h for h in (global_logger.handlers if global_logger else [])
+                          if isinstance(h, BoundedQueueHandler)), None)
+    if queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": queue_handler.queue.qsize(), "dropped": queue_handler.dropped}
 
-    try:
-        response = await call_next(request)
 
-        content_type = response.headers.get("content-type", "")
-        is_binary_content = not content_type.startswith("text/") and not content_type.startswith("application/json")
+# Metric labels used for requests that matched no route or used a nonstandard method
+UNMATCHED_ROUTE = "__unmatched__"
+KNOWN_HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
 
-        response_body = b""
-        async for chunk in response.body_iterator:
-            response_body += chunk
 
-        if should_log(request.url.path):
-            if is_binary_content:
-                response_body_snippet = f"Binary data ({len(response_body)} bytes)"
-            else:
-                response_body_snippet = response_body.decode('utf-8', errors='ignore')[:MAX_RESPONSE_BODY_LOG_LENGTH] + "..." if len(response_body) > MAX_RESPONSE_BODY_LOG_LENGTH else response_body.decode('utf-8', errors='ignore')
-        else:
-            response_body_snippet = "Details not logged due to path exclusion"
-
-        response = Response(
-            content=response_body,
-            status_code=response.status_code,
-            headers=dict(response.headers),
-            media_type=response.media_type
-        )
-    except HTTPException as e:
-        logger.warning(f"HTTP exception: {e.detail} - Status: {e.status_code}")
-        return JSONResponse(status_code=e.status_code, content={"message": e.detail})
-    except Exception as e:
-        logger.error(f"Unhandled exceptions: {str(e)}")
-        return JSONResponse(status_code=500, content={"message": "Internal Server Error"})
-
-    process_time = time.time() - start_time
-    client_host = request.client.host if request.client else "client host unknown"
-    request_line = f'"{request.method} {request.url.path} HTTP/{request.scope["http_version"]}"'
-
-    log_message = f"{client_host} - {request_line} {response.status_code} - {process_time:.6f} sec - {response_body_snippet}"
-
-    logger.info(log_message)
-    return response
+class RequestLoggingMiddleware:
+    """
+    ASGI middleware that logs incoming requests and their processing time.
+
+    The response is passed through untouched as it streams: only the first
+    MAX_RESPONSE_BODY_LOG_LENGTH bytes of opted-in routes are copied aside
+    for the log line, so time-to-first-byte and memory use do not depend on
+    the body size. Timing is taken when the last body chunk is sent.
 
+    Lines are written as text or, with ACCESS_LOG_FORMAT=json, as JSON lines,
+    and are sampled per status class (see should_sample).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.json_format = CurrentConfig.ACCESS_LOG_FORMAT == "json"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        logger = setup_logger()
+        start_time = time.time()
+        snippet = bytearray()
+        response = {"status": None, "content_type": "", "content_encoding": "",
+                    "bytes": 0, "end_time": None, "capture_body": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                # Routing has happened by now, so the route template is known
+                response["capture_body"] = should_log(self._path_template(scope)) or should_log(scope["path"])
+                for name, value in message.get("headers", []):
+                    if name == b"content-type":
+                        response["content_type"] = value.decode("latin-1")
+                    elif name == b"content-encoding":
+                        response["content_encoding"] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                response["bytes"] += len(body)
+                remaining = MAX_RESPONSE_BODY_LOG_LENGTH - len(snippet)
+                if response["capture_body"] and remaining > 0 and body:
+                    snippet.extend(body[:remaining])
+                if not message.get("more_body", False):
+                    response["end_time"] = time.time()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(f"Unhandled exceptions: {str(e)}")
+            if response["status"] is not None:
+                raise  # Headers already sent; nothing sensible left to reply with
+            error_response = JSONResponse(status_code=500, content={"message": "Internal Server Error"})
+            await error_response(scope, receive, send_wrapper)
+
+        process_time = (response["end_time"] or time.time()) - start_time
+        if metrics.ENABLED:
+            # Bounded labels only: unmatched paths and unknown methods would add a series per scanner URL
+            method = scope["method"] if scope["method"] in KNOWN_HTTP_METHODS else "OTHER"
+            route_labels = (method, self._path_template(scope, UNMATCHED_ROUTE), str(response["status"]))
+            metrics.HTTP_REQUESTS.inc(*route_labels)
+            metrics.HTTP_REQUEST_SECONDS.observe(process_time, *route_labels)
+
+        if not should_sample(response["status"]):
+            return
+
+        client = scope.get("client")
+        client_host = client[0] if client else "client host unknown"
+        response_body_snippet = self._format_snippet(snippet, response) if response["capture_body"] else None
+
+        if self.json_format:
+            entry = {
+                "ts": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+                "client": client_host,
+                "method": scope["method"],
+                "path": self._path_template(scope),
+                "status": response["status"],
+                "latency_ms": round(process_time * 1000, 3),
+                "bytes": response["bytes"],
+                "user_id": (scope.get("state") or {}).get("user_id"),
+            }
+            if response_body_snippet is not None:
+                entry["body"] = response_body_snippet
+            logger.info(json.dumps(entry, separators=(",", ":")), extra={"json_line": True})
+            return
+
+        request_line = f'"{scope["method"]} {scope["path"]} HTTP/{scope["http_version"]}"'
+        log_message = f"{client_host} - {request_line} {response['status']} - {process_time:.6f} sec - {response['bytes']} bytes"
+        if response_body_snippet is not None:
+            log_message += f" - {response_body_snippet}"
+        logger.info(log_message)
+
+    @staticmethod
+    def _path_template(scope, unmatched: Optional[str] = None) -> str:
+        """The matched route template, else `unmatched`, else the raw path."""
+        route = scope.get("route")
+        return getattr(route, "path", None) or unmatched or scope["path"]
+
+    @staticmethod
+    def _format_snippet(snippet: bytearray, response: dict) -> str:
+        content_type = response["content_type"]
+        is_binary_content = not content_type.startswith("text/") and not content_type.startswith("application/json")
+        if response["content_encoding"]:
+            return f"Compressed data ({response['bytes']} bytes, {response['content_encoding']})"
+        if is_binary_content:
+            return f"Binary data ({response['bytes']} bytes)"
+        text = snippet.decode('utf-8', errors='ignore')
+        return text + "..." if response["bytes"] > MAX_RESPONSE_BODY_LOG_LENGTH else text
 
 
 def cleanup_old_logs(logs_dir='logs', days_old=30):
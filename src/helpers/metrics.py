@@ -0,0 +1,218 @@
+# src/helpers/metrics.py
+
+import functools
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+from src.configs.config import CurrentConfig
+
+# Metrics are updated from the event loop thread (or, for worker-pool timings,
+# from the loop once the job has completed), so plain dict and int updates are
+# safe under the GIL and no locks are taken on the request path.
+ENABLED = CurrentConfig.METRICS_ENABLED
+
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter, optionally split by label values.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        if ENABLED:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def collect(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in self._values.items()]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram, optionally split by label values.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        if not ENABLED:
+            return
+        series = self._values.get(labelvalues)
+        if series is None:
+            series = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> List[str]:
+        lines = []
+        for labels, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    Gauge or counter whose values are read from a callback at scrape time.
+    The callback returns a number, or a dict mapping label-value tuples to numbers.
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable,
+                 labelnames: Tuple[str, ...] = (), kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = labelnames
+        self.kind = kind
+
+    def collect(self) -> List[str]:
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values.items() if value is not None]
+
+
+def _add_label(sample: str, label: str) -> str:
+    """Adds a `name="value"` label to one sample line of the exposition format."""
+    name_end = min(i for i in (sample.find("{"), sample.find(" ")) if i >= 0)
+    if sample[name_end] == "{":
+        return f"{sample[:name_end + 1]}{label},{sample[name_end + 1:]}"
+    return f"{sample[:name_end]}{{{label}}}{sample[name_end:]}"
+
+
+class MetricsRegistry:
+    """
+    Holds every metric and renders them in the Prometheus text exposition format.
+
+    Metrics live in the memory of the process that records them, so with the
+    pre-forked launcher (server.py) every worker has its own registry and a
+    scrape only sees the worker that happened to accept it. Every sample
+    therefore carries a `worker` label (the WORKER_ID of the process); scrape
+    each worker through its own port (SERVER_WORKER_PORT_BASE) and aggregate
+    with `sum without (worker)` in PromQL.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        worker_label = f'worker="{_escape(os.getenv("WORKER_ID", "0"))}"'
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(_add_label(sample, worker_label) for sample in metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status.",
+    ("method", "route", "status")))
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route template and status.",
+    ("method", "route", "status")))
+DB_OPERATION_SECONDS = registry.register(Histogram(
+    "db_operation_duration_seconds", "MongoDB operation latency by DB manager and method.",
+    ("manager", "method")))
+PASSWORD_HASH_SECONDS = registry.register(Histogram(
+    "password_hash_duration_seconds", "bcrypt job latency, including queue wait, by operation.",
+    ("operation",)))
+PASSWORD_HASH_WAIT_SECONDS = registry.register(Histogram(
+    "password_hash_wait_seconds", "Time bcrypt jobs spent queued before a worker picked them up.",
+    ("operation",)))
+JWT_OPERATION_SECONDS = registry.register(Histogram(
+    "jwt_operation_duration_seconds", "JWT signing and verification latency by operation.",
+    ("operation",)))
+
+_tracked_caches = []
+
+
+def register_cache(cache):
+    """
+    Expose the hit/miss counters and size of a TTLCache-like object
+    (anything with `name` and `get_stats()`).
+    """
+    _tracked_caches.append(cache)
+    return cache
+
+
+def _cache_stat(key: str) -> Callable[[], dict]:
+    return lambda: {(cache.name,): cache.get_stats()[key] for cache in _tracked_caches}
+
+
+registry.register(CallbackMetric("cache_hits_total", "Cache lookups served from memory.",
+                                 _cache_stat("hits"), ("cache",), kind="counter"))
+registry.register(CallbackMetric("cache_misses_total", "Cache lookups that were absent or expired.",
+                                 _cache_stat("misses"), ("cache",), kind="counter"))
+registry.register(CallbackMetric("cache_hit_ratio", "Fraction of cache lookups served from memory.",
+                                 _cache_stat("hit_ratio"), ("cache",)))
+registry.register(CallbackMetric("cache_entries", "Number of entries held by the cache.",
+                                 _cache_stat("size"), ("cache",)))
+
+
+def track_db_operation(func):
+    """
+    Decorator recording the latency of an async DB manager method in
+    `db_operation_duration_seconds`, labelled by class and method name.
+    """
+    manager, _, method = func.__qualname__.partition(".")
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            DB_OPERATION_SECONDS.observe(time.perf_counter() - started_at, manager, method)
+
+    return wrapper
@@ -1,6 +1,7 @@
 from src.models.item_models import ItemAttributes, ItemModel
 from src.models.category_enum_models import CategoryEnum
-from pydantic import Field, Optional
+from pydantic import Field
+from typing import Optional
 
 
 class ElectronicsAttributes(ItemAttributes):
@@ -27,6 +27,11 @@ class ItemState(str, Enum):
     DISCONTINUED = "discontinued"
     OUT_OF_STOCK = "out_of_stock"
 
+class ItemSort(str, Enum):
+    PRICE_ASC = "price"
+    PRICE_DESC = "-price"
+    NEWEST = "newest"
+
 class ItemAttributes(BaseModel):
     color: Optional[str] = None
     size: Optional[str] = None
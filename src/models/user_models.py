@@ -1,7 +1,7 @@
 # path/filename: src/models/user_models.py
 from pydantic import BaseModel, Field, EmailStr, validator,  ValidationError
 from enum import Enum
-from typing import Optional
+from typing import NamedTuple, Optional
 import re
 from datetime import datetime
 from src.utils.role_permissions import Permission, Role
@@ -21,6 +21,20 @@ ROLE_PERMISSION_MAP = {
     UserRole.SHOP_MANAGER: Role.SHOP_MANAGER,  # Mapping the new role
 }
 
+class UserAuthRecord(NamedTuple):
+    """
+    Lightweight, read-only view of a user document carrying only what the
+    authentication paths need.
+
+    Attributes:
+        id (str): The string form of the user's ObjectId.
+        role (Optional[str]): The user's role, if set.
+        password (Optional[str]): The bcrypt hash, when it was requested.
+    """
+    id: str
+    role: Optional[str]
+    password: Optional[str] = None
+
 class BaseUserModel(BaseModel):
     email: EmailStr = Field(
         ...,
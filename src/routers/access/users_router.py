@@ -1,9 +1,10 @@
 # src/routers/access/user_router.py
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.controllers.access_controller import AccessController
+from src.core.container import get_container
 from src.models.user_models import (
     SignupRequestModel, LogoutRequestModel, LogoutResponseModel,
     RefreshTokenRequestModel, RenewAccessTokenResponseModel,
@@ -13,9 +14,9 @@ from src.models.user_models import (
 
 users_router = APIRouter(tags=["users"])
 
-# Dependency that creates a new instance of AccessController
-def get_access_controller():
-    return AccessController()
+# Dependency returning the AccessController shared by all requests
+def get_access_controller(request: Request) -> AccessController:
+    return get_container(request).access_controller
 
 @users_router.post("/signup", response_model=SignupResponseModel, status_code=status.HTTP_201_CREATED)
 async def signup(signup_request: SignupRequestModel, controller: AccessController = Depends(get_access_controller)):
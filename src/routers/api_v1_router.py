@@ -2,7 +2,9 @@
 
 from fastapi import APIRouter
 from src.routers.access.users_router import users_router
+from src.routers.shop.items_router import items_router
 
 api_v1_router = APIRouter()
 
 api_v1_router.include_router(users_router, prefix="/users")
+api_v1_router.include_router(items_router, prefix="/items")
@@ -0,0 +1,53 @@
+# src/routers/internal/monitoring_router.py
+
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from src.helpers.check_connect import get_resource_history, get_mongo_stats
+from src.helpers.metrics import registry
+
+monitoring_router = APIRouter(tags=["internal"])
+
+# Served at the application root, where Prometheus scrapers expect it
+metrics_router = APIRouter(tags=["internal"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus Metrics
+
+    Exposes request counts and latency histograms per route template and status, MongoDB operation latency per DB manager method, bcrypt and JWT timings, cache hit ratios and event-loop lag in the Prometheus text format.
+
+    Every worker process keeps its own metrics and labels its samples with `worker`. Behind the pre-forked launcher, scrape each worker on its own port (`SERVER_WORKER_PORT_BASE` + worker id) and sum across the `worker` label. Resource figures such as `mongodb_connections` come from the background monitor, which only runs in worker 0.
+
+    ### Headers
+    - **x-auth-token**: The API key; configure it as a header on the Prometheus scrape job.
+
+    ### Responses
+    - **200 OK**: The metrics in text exposition format 0.0.4.
+    - **401 Unauthorized**: Missing or invalid API key.
+    """
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@monitoring_router.get("/resources", status_code=status.HTTP_200_OK)
+async def get_resources():
+    """
+    Resource Samples
+
+    Returns the in-memory history of system resource samples taken by the background monitor: CPU and memory usage, process RSS, open file descriptors, event-loop lag and garbage-collector pauses, plus the latest MongoDB serverStatus figures.
+
+    ### Headers
+    - **x-auth-token**: The API key.
+
+    ### Responses
+    - **200 OK**: The samples, oldest first, and the latest MongoDB figures.
+    - **401 Unauthorized**: Missing or invalid API key.
+    """
+    history = get_resource_history()
+    return {
+        "latest": history[-1] if history else None,
+        "history": history,
+        "mongo": get_mongo_stats(),
+    }
@@ -0,0 +1,145 @@
+# src/routers/shop/items_router.py
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from src.auth.authentication_middleware import JWTAuthentication
+
+from src.controllers.item_controller import ItemController
+from src.core.container import get_container
+from src.models.category_enum_models import CategoryEnum
+from src.models.item_models import ItemSort, ItemState
+
+items_router = APIRouter(tags=["items"])
+
+# Dependency returning the ItemController shared by all requests
+def get_item_controller(request: Request) -> ItemController:
+    return get_container(request).item_controller
+
+@items_router.get("")
+async def list_items(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of items per page."),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`."),
+    sort: ItemSort = Query(ItemSort.NEWEST, description="Sort order: `newest`, `price` or `-price`."),
+    category: Optional[CategoryEnum] = Query(None, description="Only items of this category."),
+    state: Optional[ItemState] = Query(ItemState.ACTIVE, description="Only items in this state."),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price, inclusive."),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price, inclusive."),
+    include_total: bool = Query(False, description="Include an estimated total of matching items."),
+    controller: ItemController = Depends(get_item_controller),
+):
+    """
+    List Items
+
+    Returns the item catalog one page at a time. Pages are linked by an opaque cursor rather than page numbers, so every page is served by an index range scan and deep pages are as fast as the first one. Pass the returned `next_cursor` unchanged, with the same `sort`, to fetch the following page.
+
+    ### Query Parameters
+    - **limit**: Number of items per page (1-100).
+    - **cursor**: Cursor returned by the previous page; omit for the first page.
+    - **sort**: `newest` (default), `price` (ascending) or `-price` (descending).
+    - **category**, **state**, **min_price**, **max_price**: Optional filters.
+    - **include_total**: Adds `estimated_total`; filtered counts stop at a configured cap.
+
+    ### Responses
+    - **200 OK**: A page of items with `pagination.next_cursor` (null on the last page).
+    - **400 Bad Request**: The cursor is malformed or was issued for a different sort order.
+    - **422 Unprocessable Entity**: Invalid query parameters.
+    """
+    return await controller.list_items(limit, cursor, sort, category, state, min_price, max_price, include_total)
+
+@items_router.get("/search")
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms."),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return."),
+    offset: int = Query(0, ge=0, le=1000, description="Number of best matches to skip."),
+    category: Optional[CategoryEnum] = Query(None, description="Only items of this category."),
+    state: Optional[ItemState] = Query(ItemState.ACTIVE, description="Only items in this state."),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price, inclusive."),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price, inclusive."),
+    controller: ItemController = Depends(get_item_controller),
+):
+    """
+    Search Items
+
+    Full-text search over item names, tags and descriptions, best matches first. Matching ignores case and accents; the last term also matches as a prefix ("sneak" finds "sneakers") and terms of four or more letters tolerate one typo. Every term must match. Workers without the in-process index, and every worker while it is being built, answer from the MongoDB text index, which matches whole words only.
+
+    ### Query Parameters
+    - **q**: Search terms.
+    - **limit**, **offset**: Page of results (offset up to 1000).
+    - **category**, **state**, **min_price**, **max_price**: Optional filters, as in the listing.
+
+    ### Responses
+    - **200 OK**: `items` (each with a relevance `score`), `total`, `facets` (counts by category, state and price bucket; with `facets_complete` false they only count the best `SEARCH_FACET_SCAN_LIMIT` matches) and the `engine` that answered (`index` or `mongo`).
+    - **422 Unprocessable Entity**: Invalid query parameters.
+    """
+    return await controller.search_items(q, limit, offset, category, state, min_price, max_price)
+
+@items_router.get("/export")
+async def export_items(
+    file_format: str = Query("ndjson", alias="format", regex="^(ndjson|csv)$",
+                             description="`ndjson` (default) or `csv`."),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export, e.g. `name,price,attributes.color`."),
+    category: Optional[CategoryEnum] = Query(None, description="Only items of this category."),
+    state: Optional[ItemState] = Query(None, description="Only items in this state."),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price, inclusive."),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price, inclusive."),
+    user: Optional[str] = Query(None, description="Only items owned by this user (shop)."),
+    user_info: dict = Depends(JWTAuthentication.authenticate_token),
+    controller: ItemController = Depends(get_item_controller),
+):
+    """
+    Export Items
+
+    Streams every matching item as NDJSON or CSV. Items are read from the database in batches and written to the response as they arrive, so exports of any size use constant memory. The CSV layout matches the bulk import format (dotted columns for attributes, `|`-separated tags). Compressed when the client accepts it.
+
+    ### Query Parameters
+    - **format**: `ndjson` or `csv`.
+    - **fields**: Optional projection; `_id` is always included.
+    - **category**, **state**, **min_price**, **max_price**, **user**: Optional filters, as in the listing.
+
+    ### Responses
+    - **200 OK**: The exported items, streamed as an attachment.
+    - **400 Bad Request**: Unknown export field.
+    - **401 Unauthorized**: Missing or invalid access token.
+    """
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    return await controller.export_items(file_format, field_list, category, state, min_price, max_price, user)
+
+@items_router.post("/import")
+async def import_items(
+    request: Request,
+    file_format: Optional[str] = Query(None, alias="format", regex="^(ndjson|csv)$",
+                                       description="`ndjson` or `csv`; defaults from the Content-Type header."),
+    user_info: dict = Depends(JWTAuthentication.authenticate_token),
+    controller: ItemController = Depends(get_item_controller),
+):
+    """
+    Bulk Import Items
+
+    Imports a catalog streamed in the request body, either as NDJSON (one item object per line) or as CSV with a header row. Rows are validated against the item model for their category and written in chunks with unordered bulk writes; invalid rows are reported individually and do not abort the import. The authenticated user becomes the owner of the imported items.
+
+    ### Request Body
+    - **NDJSON** (`Content-Type: application/x-ndjson`): one JSON item per line.
+    - **CSV** (`Content-Type: text/csv`): header row with item fields; use dotted columns for nested fields (e.g. `attributes.color`) and `|` to separate tags.
+
+    ### Responses
+    - **200 OK**: Import finished. Returns `received`, `inserted` and `failed` counts and per-row `errors` (row numbers are 1-based data rows).
+    - **400 Bad Request**: The CSV header row exceeds the size limit. Oversized data lines and records are reported as row errors.
+    - **401 Unauthorized**: Missing or invalid access token.
+    """
+    file_format = file_format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    return await controller.import_items(request.stream(), file_format, user_info["user_id"])
+
+# Declared last so that the fixed paths above take precedence over `/{item_id}`
+@items_router.get("/{item_id}")
+async def get_item(item_id: str, controller: ItemController = Depends(get_item_controller)):
+    """
+    Get Item
+
+    Returns a single item, e.g. for a product detail page. Hot items are served from an in-process cache; concurrent requests for an uncached item share one database query. Updates and deletes made on the same worker are reflected immediately, on other workers within ITEM_CACHE_TTL_SECONDS.
+
+    ### Responses
+    - **200 OK**: The item document.
+    - **400 Bad Request**: The id is not a valid ObjectId.
+    - **404 Not Found**: No item with this id.
+    """
+    return await controller.get_item(item_id)
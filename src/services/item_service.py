@@ -1,8 +1,61 @@
 # src/services/item_service.py
-from src.models.item_models import ItemModel
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import ASCENDING, DESCENDING
+from src.models.item_models import ItemModel, ItemSort, ItemState
+from src.models.category_enum_models import CategoryEnum
 from src.models.clothing_models import ClothingModel
 from src.models.electronic_models import ElectronicsModel
 from src.core.error_response_handler import ErrorResponseHandler
+from src.core.success_response_handler import SuccessResponseHandler
+from src.configs.config import CurrentConfig
+from src.dbs.item_db_manager import ItemDBManager
+from src.utils.pagination import KeysetSort, decode_cursor, encode_cursor
+from src.utils.bulk_import import Row, iter_chunks, iter_csv_rows, iter_lines, iter_ndjson_rows
+from src.utils.bulk_export import csv_batches, ndjson_batches
+
+ITEM_SORTS = {
+    ItemSort.PRICE_ASC: KeysetSort(ItemSort.PRICE_ASC.value, "price", ASCENDING),
+    ItemSort.PRICE_DESC: KeysetSort(ItemSort.PRICE_DESC.value, "price", DESCENDING),
+    ItemSort.NEWEST: KeysetSort(ItemSort.NEWEST.value, None, DESCENDING),
+}
+
+# Columns of a full CSV export; nested attributes are flattened to dotted columns
+EXPORT_COLUMNS = ["_id", "name", "description", "price", "stock_quantity", "category", "state",
+                  "user", "tags", "thumbnail", "attributes.color", "attributes.size",
+                  "attributes.material", "attributes.weight", "attributes.gender",
+                  "attributes.warranty_period", "attributes.power_usage"]
+
+# Model used to validate an imported row, by its `category`
+IMPORT_MODELS = {
+    CategoryEnum.CLOTHING.value: ClothingModel,
+    CategoryEnum.ELECTRONICS.value: ElectronicsModel,
+}
+
+def build_item_filter(category: Optional[CategoryEnum] = None,
+                      state: Optional[ItemState] = None,
+                      min_price: Optional[float] = None,
+                      max_price: Optional[float] = None,
+                      user: Optional[str] = None) -> dict:
+    """Builds the MongoDB filter shared by the item listing, export and search endpoints."""
+    query = {}
+    if category is not None:
+        query["category"] = category.value
+    if state is not None:
+        query["state"] = state.value
+    if user is not None:
+        query["user"] = user
+    price_range = {}
+    if min_price is not None:
+        price_range["$gte"] = min_price
+    if max_price is not None:
+        price_range["$lte"] = max_price
+    if price_range:
+        query["price"] = price_range
+    return query
+
 
 class ItemFactory:
     item_classes = {
@@ -39,3 +92,202 @@ class Electronics(Item):
         new_electronics = await ElectronicsModel.create(**self.attributes)
         self.id = new_electronics.id
         return await super().create_item()
+
+
+class ItemService:
+    def __init__(self, item_db_manager: Optional[ItemDBManager] = None):
+        self.item_db_manager = item_db_manager or ItemDBManager()
+
+    async def get_item(self, item_id: str) -> dict:
+        """
+        Retrieves one item, served from the item cache when possible.
+
+        Parameters:
+        - item_id: The item's ObjectId as a string.
+
+        Returns:
+        - A success response with the item document.
+
+        Raises:
+        - Raises an error response if the id is malformed or the item does not exist.
+        """
+        if not ObjectId.is_valid(item_id):
+            ErrorResponseHandler.bad_request("Invalid item id")
+        item = await self.item_db_manager.find_item_by_id(item_id)
+        if item is None:
+            ErrorResponseHandler.not_found("Item not found")
+        return SuccessResponseHandler.general_success(data=item, message="Item retrieved")
+
+    async def list_items(self, limit: int, cursor: Optional[str] = None,
+                         sort: ItemSort = ItemSort.NEWEST,
+                         category: Optional[CategoryEnum] = None,
+                         state: Optional[ItemState] = ItemState.ACTIVE,
+                         min_price: Optional[float] = None,
+                         max_price: Optional[float] = None,
+                         include_total: bool = False) -> dict:
+        """
+        Lists items one page at a time using keyset pagination.
+
+        Pages continue from the (sort key, _id) of the previous page's last item
+        instead of skipping over earlier results, so deep pages cost the same as
+        the first one. One extra item is fetched to tell whether a next page exists.
+
+        Parameters:
+        - limit: Maximum number of items on the page.
+        - cursor: Opaque cursor returned with the previous page.
+        - sort: The sort order; cursors are only valid for the sort they were issued for.
+        - category, state, min_price, max_price: Optional filters.
+        - include_total: Also return an estimated total of matching items.
+
+        Returns:
+        - A cursor-paginated success response.
+
+        Raises:
+        - Raises an error response if the cursor is invalid.
+        """
+        keyset_sort = ITEM_SORTS[sort]
+        query = build_item_filter(category, state, min_price, max_price)
+
+        page_query = query
+        if cursor:
+            keyset = decode_cursor(keyset_sort, cursor)
+            page_query = {"$and": [query, keyset]} if query else keyset
+
+        items = await self.item_db_manager.find_items(page_query, keyset_sort.mongo_sort(), limit + 1)
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(keyset_sort, items[-1])
+
+        total = None
+        if include_total:
+            total = await self.item_db_manager.count_items(query, limit=CurrentConfig.ITEMS_COUNT_LIMIT)
+
+        return SuccessResponseHandler.cursor_paginated_response(
+            data=[ItemDBManager.convert_objectid_to_str(item) for item in items],
+            limit=limit,
+            next_cursor=next_cursor,
+            total=total,
+            message="Items retrieved successfully"
+        )
+
+    @staticmethod
+    def _validate_chunk(chunk: List[Row], user_id: str) -> Tuple[List[dict], List[int], List[dict]]:
+        """
+        Validates a chunk of parsed rows against the item models.
+
+        Returns:
+        - The documents to insert, the row number of each document, and the
+          errors of the rows that failed to parse or validate.
+        """
+        documents, row_numbers, errors = [], [], []
+        for row_number, fields, parse_error in chunk:
+            if parse_error is not None:
+                errors.append({"row": row_number, "error": parse_error})
+                continue
+            fields["user"] = user_id
+            model = IMPORT_MODELS.get(fields.get("category"), ItemModel)
+            try:
+                document = model(**fields).dict(by_alias=True)
+            except ValidationError as e:
+                errors.append({"row": row_number, "error": "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())})
+                continue
+            document["_id"] = ObjectId(document["_id"])
+            documents.append(document)
+            row_numbers.append(row_number)
+        return documents, row_numbers, errors
+
+    async def import_items(self, chunks: AsyncIterator[bytes], file_format: str, user_id: str) -> dict:
+        """
+        Imports items from an NDJSON or CSV byte stream.
+
+        Rows are parsed as they arrive and handled ITEMS_IMPORT_CHUNK_SIZE at a
+        time: each chunk is validated (off the event loop) and written with one
+        unordered bulk write before the next chunk is read, so only one chunk is
+        held in memory. Invalid rows and rejected writes are reported per row
+        and do not abort the import.
+
+        Parameters:
+        - chunks: The request body stream.
+        - file_format: "ndjson" or "csv" (CSV needs a header row; nested fields
+          use dotted columns such as `attributes.color`, tags are `|`-separated).
+        - user_id: The importing user, recorded as the items' owner.
+
+        Returns:
+        - A success response with received/inserted/failed counts and the
+          first ITEMS_IMPORT_MAX_ERRORS row errors.
+        """
+        lines = iter_lines(chunks, CurrentConfig.ITEMS_IMPORT_MAX_LINE_BYTES)
+        if file_format == "csv":
+            rows = iter_csv_rows(lines, CurrentConfig.ITEMS_IMPORT_MAX_LINE_BYTES)
+        else:
+            rows = iter_ndjson_rows(lines)
+
+        received = inserted = failed = 0
+        errors = []
+
+        def record_errors(new_errors: List[dict]):
+            nonlocal failed
+            failed += len(new_errors)
+            errors.extend(new_errors[:max(0, CurrentConfig.ITEMS_IMPORT_MAX_ERRORS - len(errors))])
+
+        async for chunk in iter_chunks(rows, CurrentConfig.ITEMS_IMPORT_CHUNK_SIZE):
+            received += len(chunk)
+            documents, row_numbers, chunk_errors = await asyncio.to_thread(self._validate_chunk, chunk, user_id)
+            if documents:
+                chunk_inserted, write_errors = await self.item_db_manager.bulk_insert_items(documents)
+                inserted += chunk_inserted
+                chunk_errors.extend({"row": row_numbers[index], "error": message} for index, message in write_errors)
+                chunk_errors.sort(key=lambda error: error["row"])
+            record_errors(chunk_errors)
+
+        return SuccessResponseHandler.general_success(
+            data={
+                "received": received,
+                "inserted": inserted,
+                "failed": failed,
+                "errors": errors,
+                "errors_truncated": failed > len(errors),
+            },
+            message="Items imported" if not failed else "Items imported with errors"
+        )
+
+    def export_items(self, file_format: str, fields: Optional[List[str]] = None,
+                     category: Optional[CategoryEnum] = None,
+                     state: Optional[ItemState] = None,
+                     min_price: Optional[float] = None,
+                     max_price: Optional[float] = None,
+                     user: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Streams the items matching the listing filters as NDJSON or CSV.
+
+        Items are read through a cursor in ITEMS_EXPORT_BATCH_SIZE batches and
+        serialized as they arrive, so memory use does not grow with the catalog.
+
+        Parameters:
+        - file_format: "ndjson" or "csv".
+        - fields: Optional field projection (dotted names address attributes);
+          `_id` is always included.
+        - category, state, min_price, max_price, user: Optional filters.
+
+        Returns:
+        - An async iterator over the encoded response body.
+
+        Raises:
+        - Raises an error response if a requested field is unknown.
+        """
+        if fields:
+            unknown = [field for field in fields if field not in EXPORT_COLUMNS]
+            if unknown:
+                ErrorResponseHandler.bad_request(f"Unknown export fields: {', '.join(unknown)}")
+            columns = ["_id"] + [field for field in fields if field != "_id"]
+            projection = {field: 1 for field in columns}
+        else:
+            columns, projection = EXPORT_COLUMNS, None
+
+        query = build_item_filter(category, state, min_price, max_price, user)
+        documents = self.item_db_manager.iter_items(query, projection, CurrentConfig.ITEMS_EXPORT_BATCH_SIZE)
+        if file_format == "csv":
+            return csv_batches(documents, columns, CurrentConfig.ITEMS_EXPORT_FLUSH_BYTES)
+        return ndjson_batches(documents, CurrentConfig.ITEMS_EXPORT_FLUSH_BYTES)
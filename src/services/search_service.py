@@ -0,0 +1,190 @@
+# src/services/search_service.py
+import asyncio
+import time
+from typing import List, Optional
+from bson import ObjectId
+from src.configs.config import CurrentConfig
+from src.core.success_response_handler import SuccessResponseHandler
+from src.dbs.item_db_manager import ItemDBManager
+from src.helpers import metrics
+from src.helpers.log_config import setup_logger
+from src.models.category_enum_models import CategoryEnum
+from src.models.item_models import ItemState
+from src.services.item_service import build_item_filter
+from src.utils.search_index import InvertedIndex, price_bucket_labels
+
+PRICE_BOUNDARIES = sorted(float(boundary) for boundary in CurrentConfig.SEARCH_PRICE_BUCKETS.split(",")
+                          if boundary.strip())
+
+# Fields the index needs when it is (re)built from the collection
+INDEXED_FIELDS = {"name": 1, "description": 1, "tags": 1, "category": 1, "state": 1, "price": 1}
+
+SEARCH_SECONDS = metrics.registry.register(metrics.Histogram(
+    "item_search_duration_seconds", "Item search latency by engine (index or mongo).", ("engine",)))
+
+
+class SearchService:
+    """
+    Full-text item search with relevance ranking and facet counts.
+
+    Queries are answered by an in-process InvertedIndex built from the `items`
+    collection at startup, in the workers listed in SEARCH_INDEX_WORKERS. The
+    index follows writes made through the ItemDBManager it listens to; writes
+    made by other workers are picked up by a full rebuild every
+    SEARCH_REBUILD_INTERVAL_SECONDS. Workers without an index, and every
+    worker until its first build completes (or with SEARCH_INDEX_ENABLED off),
+    use the MongoDB text index instead.
+
+    The index is sized for catalogs of up to about 200,000 items (see
+    InvertedIndex); larger catalogs should disable it and rely on MongoDB.
+
+    Attributes:
+        item_db_manager (ItemDBManager): Source of the indexed items.
+        index (Optional[InvertedIndex]): The live index, None until built.
+    """
+
+    logger = setup_logger()
+
+    def __init__(self, item_db_manager: ItemDBManager):
+        self.item_db_manager = item_db_manager
+        self.index: Optional[InvertedIndex] = None
+        self._pending: Optional[list] = None
+        item_db_manager.add_change_listener(self)
+        metrics.registry.register(metrics.CallbackMetric(
+            "item_search_index_documents", "Items held by the in-process search index.",
+            lambda: {(): len(self.index) if self.index is not None else 0}))
+
+    # Change listener interface of ItemDBManager
+    def item_saved(self, document: dict):
+        if self.index is not None:
+            self.index.add(document)
+        if self._pending is not None:
+            self._pending.append((True, document))
+
+    def item_deleted(self, item_id: str):
+        if self.index is not None:
+            self.index.remove(item_id)
+        if self._pending is not None:
+            self._pending.append((False, item_id))
+
+    async def rebuild(self):
+        """
+        Builds a new index from the collection and swaps it in. Writes seen
+        while the collection is being read are replayed onto the new index
+        before the swap, so none are lost.
+
+        The new index is not shared until the swap, so batches of
+        SEARCH_BUILD_BATCH_SIZE documents are indexed in a worker thread and
+        the event loop keeps serving requests during the build. The old and
+        new index are both held in memory until the swap.
+        """
+        started_at = time.perf_counter()
+        index = InvertedIndex(PRICE_BOUNDARIES, CurrentConfig.SEARCH_MAX_EXPANSIONS,
+                              CurrentConfig.SEARCH_FACET_SCAN_LIMIT)
+        batch_size = CurrentConfig.SEARCH_BUILD_BATCH_SIZE
+        self._pending = []
+        try:
+            batch = []
+            async for document in self.item_db_manager.iter_items({}, INDEXED_FIELDS, batch_size):
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    await asyncio.to_thread(index.add_many, batch)
+                    batch = []
+            if batch:
+                await asyncio.to_thread(index.add_many, batch)
+            for saved, payload in self._pending:
+                if saved:
+                    index.add(payload)
+                else:
+                    index.remove(payload)
+            self.index = index
+        finally:
+            self._pending = None
+        self.logger.info(f"Search index built: {len(index)} items, {index.vocabulary_size} terms "
+                         f"in {time.perf_counter() - started_at:.1f}s")
+
+    async def run(self):
+        """Builds the index, then rebuilds it periodically. Runs for the lifetime of the worker."""
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as e:
+                self.logger.error(f"Search index build failed: {e}")
+            if CurrentConfig.SEARCH_REBUILD_INTERVAL_SECONDS <= 0:
+                return
+            await asyncio.sleep(CurrentConfig.SEARCH_REBUILD_INTERVAL_SECONDS)
+
+    async def search_items(self, text: str, limit: int, offset: int = 0,
+                           category: Optional[CategoryEnum] = None,
+                           state: Optional[ItemState] = ItemState.ACTIVE,
+                           min_price: Optional[float] = None,
+                           max_price: Optional[float] = None) -> dict:
+        """
+        Searches item names, tags and descriptions.
+
+        Parameters:
+        - text: The search terms; the last one also matches as a prefix when
+          the in-process index is used.
+        - limit: Maximum number of items to return.
+        - offset: Number of best matches to skip.
+        - category, state, min_price, max_price: Optional filters.
+
+        Returns:
+        - A success response with the ranked `items` (each with a `score`),
+          `total`, the `facets` counts, whether they cover every match
+          (`facets_complete`) and the `engine` that answered.
+        """
+        started_at = time.perf_counter()
+        if self.index is not None:
+            engine = "index"
+            result = self.index.search(text, limit, offset,
+                                       category.value if category is not None else None,
+                                       state.value if state is not None else None,
+                                       min_price, max_price)
+            items = await self._load_hits(result.hits)
+            total, facets, facets_complete = result.total, result.facets, result.facets_complete
+        else:
+            engine = "mongo"
+            items, total, facets = await self._text_search(text, limit, offset, category, state,
+                                                           min_price, max_price)
+            facets_complete = True
+        SEARCH_SECONDS.observe(time.perf_counter() - started_at, engine)
+        return SuccessResponseHandler.general_success(
+            data={"items": items, "total": total, "facets": facets, "facets_complete": facets_complete,
+                  "engine": engine},
+            message="Items found"
+        )
+
+    async def _load_hits(self, hits: List[tuple]) -> List[dict]:
+        """Fetches the documents of a page of hits, keeping the ranking order."""
+        if not hits:
+            return []
+        ids = [ObjectId(item_id) for item_id, _ in hits]
+        documents = await self.item_db_manager.find_items({"_id": {"$in": ids}}, [("_id", 1)], len(ids))
+        by_id = {str(document["_id"]): document for document in documents}
+        items = []
+        for item_id, score in hits:
+            document = by_id.get(item_id)
+            if document is not None:  # Deleted since it was indexed
+                document["score"] = round(score, 4)
+                items.append(document)
+        return items
+
+    async def _text_search(self, text: str, limit: int, offset: int, category: Optional[CategoryEnum],
+                           state: Optional[ItemState], min_price: Optional[float],
+                           max_price: Optional[float]) -> tuple:
+        query = build_item_filter(category, state, min_price, max_price)
+        result = await self.item_db_manager.text_search(text, query, offset, limit, PRICE_BOUNDARIES)
+        total = result["total"][0]["count"] if result.get("total") else 0
+        labels = price_bucket_labels(PRICE_BOUNDARIES)
+        label_by_bound = dict(zip(PRICE_BOUNDARIES, labels))
+        prices = dict.fromkeys(labels, 0)
+        for group in result.get("price", []):
+            label = labels[-1] if group["_id"] == "overflow" else label_by_bound[float(group["_id"])]
+            prices[label] += group["count"]
+        facets = {
+            "category": {group["_id"]: group["count"] for group in result.get("category", []) if group["_id"]},
+            "state": {group["_id"]: group["count"] for group in result.get("state", []) if group["_id"]},
+            "price": prices,
+        }
+        return result.get("items", []), total, facets
@@ -3,20 +3,22 @@
 from src.models.user_models import SignupRequestModel
 from src.dbs.key_db_manager import KeyDBManager
 from src.utils.security import (
-    JWTError, hash_password, verify_password, create_token, decode_token, is_password_complex, get_jwt_public_key, get_jwt_secret_key
+    JWTError, hash_password, verify_password, create_token, decode_token, is_password_complex
 )
+from src.utils.key_ring import key_ring
 from src.utils.email_reset import send_reset_email
 from src.dbs.user_db_manager import UserDBManager
 from bson import ObjectId
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 from src.core.success_response_handler import SuccessResponseHandler
 from src.core.user_error_response_handler import UserErrorResponseHandler
 
 class UserService:
-    def __init__(self):
-        self.user_db_manager = UserDBManager()
-        self.key_db_manager = KeyDBManager()
+    def __init__(self, user_db_manager: Optional[UserDBManager] = None,
+                 key_db_manager: Optional[KeyDBManager] = None):
+        self.user_db_manager = user_db_manager or UserDBManager()
+        self.key_db_manager = key_db_manager or KeyDBManager()
 
     async def register_user(self, signup_request: SignupRequestModel) -> dict:
         """
@@ -31,7 +33,7 @@ class UserService:
         Raises:
         - Raises an error response if the email is already registered.
         """
-        if await self.user_db_manager.find_user_by_email(signup_request.email):
+        if await self.user_db_manager.find_user_by_email(signup_request.email, projection={"_id": 1}):
             UserErrorResponseHandler.email_already_registered()
 
         hashed_password = await hash_password(signup_request.password)
@@ -76,30 +78,24 @@ class UserService:
         """
         
         # Attempt to find the user by email
-        user = await self.user_db_manager.find_user_by_email(email)
-        if not user or not await verify_password(password, user['password']):
+        user = await self.user_db_manager.find_user_auth_by_email(email)
+        if not user or not await verify_password(password, user.password):
             # Handle incorrect email or password error
             UserErrorResponseHandler.incorrect_email_or_password()
 
         # Generate tokens
-        access_token = create_token(data={"sub": str(user["_id"])}, is_refresh_token=False)
-        refresh_token = create_token(data={"sub": str(user["_id"])}, is_refresh_token=True)
+        access_token = create_token(data={"sub": user.id}, is_refresh_token=False)
+        refresh_token = create_token(data={"sub": user.id}, is_refresh_token=True)
 
-        
-        # Load key configuration
-        public_key = get_jwt_public_key()
-        private_key = get_jwt_secret_key()
-
-        # Save key information asynchronously
+        # Save key information asynchronously, referencing the signing key by id
         await self.key_db_manager.save_key_information(
-            user_id=str(user["_id"]),
+            user_id=user.id,
             refresh_token=refresh_token,
-            public_key=public_key,  # Assumes public_key is correctly loaded
-            private_key=private_key  # Assumes private_key is correctly loaded
+            kid=key_ring.material.kid
         )
         
         # Retrieve or default user role
-        user_role = user.get('role', 'Unknown')
+        user_role = user.role or 'Unknown'
 
         # Return successful authentication response
         return SuccessResponseHandler.user_authenticated(
@@ -128,33 +124,30 @@ class UserService:
             if not user_id:
                 return UserErrorResponseHandler.invalid_token()
 
-            user = await self.user_db_manager.find_user_by_id(user_id)
+            if payload.get("type") != "refresh":
+                return UserErrorResponseHandler.invalid_token()
+
+            user = await self.user_db_manager.find_user_auth_by_id(user_id, use_cache=True)
             if not user:
                 return UserErrorResponseHandler.user_not_found()
 
-            key_info = await self.key_db_manager.find_key_information(user_id)
-
-            # New condition: Check if key_info does not exist
-            if not key_info:
-                return UserErrorResponseHandler.invalid_token()
-
-            # Check if the refresh token has already been used
-            if refresh_token in key_info.get("refresh_tokens_used", []):
-                # Security response: delete the token from the list and return an error
-                await self.key_db_manager.delete_refresh_token(user_id, refresh_token)
-                return UserErrorResponseHandler.suspicious_activity_detected()
-            
-            # Add the current refresh token to the list of used tokens before issuing a new one
-            token_add_success = await self.key_db_manager.add_refresh_token_to_list(user_id, refresh_token)
-            if not token_add_success:
-                # Handle the failure to add the refresh token to the list appropriately
-                return UserErrorResponseHandler.operation_failed("Failed to record the refresh token.")
-
-            # Proceed with creating a new access token
             new_access_token = create_token(data={"sub": user_id}, is_refresh_token=False)
-            new_refresh_token = create_token(data={"sub": str(user["_id"])}, is_refresh_token=True)
+            new_refresh_token = create_token(data={"sub": user.id}, is_refresh_token=True)
+
+            # Retire the presented token and store its replacement in one conditional
+            # update; it only matches while the token is current and unused
+            rotated = await self.key_db_manager.rotate_refresh_token(user_id, refresh_token, new_refresh_token)
+            if not rotated:
+                # Only a token that was already rotated is a replay; revoke the whole
+                # session then. Anything else (logged out, superseded by a newer login)
+                # is just an invalid token and must not end the current session.
+                key_record = await self.key_db_manager.find_by_refresh_token_used(refresh_token)
+                if key_record and key_record.get("user_id") == user_id:
+                    await self.key_db_manager.delete_refresh_token(user_id, refresh_token)
+                    return UserErrorResponseHandler.suspicious_activity_detected()
+                return UserErrorResponseHandler.invalid_token()
 
-            user_role = user.get('role', 'Unknown')
+            user_role = user.role or 'Unknown'
 
             # Return the newly generated access token and user role
             return SuccessResponseHandler.renewed_access_token(access_token=new_access_token, 
@@ -180,8 +173,8 @@ class UserService:
         Raises:
         - Raises an error response if the current password is incorrect or the new password does not meet complexity requirements.
         """
-        user = await self.user_db_manager.find_user_by_email(email)
-        if not user or not await verify_password(current_password, user['password']):
+        user = await self.user_db_manager.find_user_auth_by_email(email)
+        if not user or not await verify_password(current_password, user.password):
             UserErrorResponseHandler.incorrect_email_or_password()
 
         if not is_password_complex(new_password):
@@ -209,7 +202,7 @@ class UserService:
         Raises:
         - Raises an error response if the user cannot be found or if sending the reset email fails.
         """
-        user = await self.user_db_manager.find_user_by_email(email)
+        user = await self.user_db_manager.find_user_by_email(email, projection={"_id": 1})
         if not user:
             UserErrorResponseHandler.user_not_found()
 
@@ -240,7 +233,7 @@ class UserService:
         - A success response indicating the user has been logged out.
         """
         # Validate user_id and refresh_token
-        key_info = await self.key_db_manager.find_key_information(user_id)
+        key_info = await self.key_db_manager.find_key_information(user_id, use_cache=False)
         if not key_info:
             return UserErrorResponseHandler.invalid_token()
 
@@ -0,0 +1,62 @@
+# src/utils/bulk_export.py
+
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List
+from src.core.json_response import dumps
+
+
+async def ndjson_batches(documents: AsyncIterator[dict], flush_bytes: int) -> AsyncIterator[bytes]:
+    """
+    Serializes documents as NDJSON, yielding roughly `flush_bytes` at a time so
+    the response is sent in few, reasonably sized chunks.
+    """
+    buffer = bytearray()
+    async for document in documents:
+        buffer += dumps(document)
+        buffer += b"\n"
+        if len(buffer) >= flush_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _csv_value(value: Any) -> str:
+    """Formats a field like the bulk import expects it back (tags `|`-joined)."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "|".join(str(item) for item in value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _lookup(document: dict, column: str) -> Any:
+    value = document
+    for part in column.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+async def csv_batches(documents: AsyncIterator[dict], columns: List[str],
+                      flush_bytes: int) -> AsyncIterator[bytes]:
+    """
+    Serializes documents as CSV with a header row. Nested fields are addressed
+    by dotted column names (e.g. `attributes.color`), matching the import format.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    async for document in documents:
+        writer.writerow([_csv_value(_lookup(document, column)) for column in columns])
+        if buffer.tell() >= flush_bytes:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,157 @@
+# src/utils/bulk_import.py
+
+import csv
+import json
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple, Union
+from src.core.error_response_handler import ErrorResponseHandler
+
+# A parsed input row: (1-based row number, fields) or (row number, parse error)
+Row = Tuple[int, Optional[dict], Optional[str]]
+
+
+class OversizedLine(NamedTuple):
+    """
+    Stands in for a line longer than the limit, which was discarded.
+
+    Attributes:
+        length (int): Size of the discarded line in bytes.
+        quotes (int): Number of `"` characters it contained, so CSV parsing can
+            keep track of quoted fields across it.
+    """
+    length: int
+    quotes: int
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Union[str, OversizedLine]]:
+    """
+    Splits a byte stream into decoded lines without buffering more than one line.
+    Lines longer than `max_line_bytes` are discarded as they arrive and reported
+    as an OversizedLine, so the rows around them can still be imported.
+    """
+    buffer = b""
+    skipped: Optional[OversizedLine] = None  # The oversized line being discarded
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipped is not None or len(line) > max_line_bytes:
+                previous = skipped or OversizedLine(0, 0)
+                yield OversizedLine(previous.length + len(line), previous.quotes + line.count(b'"'))
+                skipped = None
+            else:
+                yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if len(buffer) > max_line_bytes:
+            previous = skipped or OversizedLine(0, 0)
+            skipped = OversizedLine(previous.length + len(buffer), previous.quotes + buffer.count(b'"'))
+            buffer = b""
+    if skipped is not None:
+        yield OversizedLine(skipped.length + len(buffer), skipped.quotes + buffer.count(b'"'))
+    elif buffer.strip():
+        yield buffer.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[Union[str, OversizedLine]]) -> AsyncIterator[Row]:
+    """Parses one JSON object per line; blank lines are skipped."""
+    row_number = 0
+    async for line in lines:
+        if isinstance(line, OversizedLine):
+            row_number += 1
+            yield row_number, None, f"Line of {line.length} bytes exceeds the size limit"
+            continue
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            fields = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(fields, dict):
+            yield row_number, None, "Expected a JSON object"
+            continue
+        yield row_number, fields, None
+
+
+def _unflatten(record: dict) -> dict:
+    """Turns CSV columns into item fields: `attributes.color` nests, `tags` splits on `|`."""
+    fields = {}
+    for column, value in record.items():
+        if column is None or value is None or value == "":
+            continue
+        if column == "tags":
+            value = [tag.strip() for tag in value.split("|") if tag.strip()]
+        target = fields
+        *parents, key = column.strip().split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    return fields
+
+
+async def iter_csv_rows(lines: AsyncIterator[Union[str, OversizedLine]],
+                        max_record_bytes: int) -> AsyncIterator[Row]:
+    """
+    Parses CSV with a header row. Quoted fields may span lines: physical lines
+    are joined while a quote is still open, so only one record is buffered.
+    A record longer than `max_record_bytes` is dropped and reported as a row
+    error; quotes are still counted through it, so parsing resumes at the next
+    record.
+
+    Raises:
+        HTTPException (400): If the header row exceeds `max_record_bytes`.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    pending_size = 0
+    quotes = 0
+    oversized = False
+    row_number = 0
+    async for line in lines:
+        if isinstance(line, OversizedLine):
+            quotes += line.quotes
+            oversized, pending = True, []
+        else:
+            quotes += line.count('"')
+            if not oversized:
+                pending.append(line)
+                pending_size += len(line) + 1
+                if pending_size > max_record_bytes:
+                    oversized, pending = True, []
+        if quotes % 2:
+            continue  # Inside a quoted field that continues on the next line
+
+        record, record_oversized = pending, oversized
+        pending, pending_size, quotes, oversized = [], 0, 0, False
+        if record_oversized:
+            if header is None:
+                ErrorResponseHandler.bad_request(f"CSV header longer than {max_record_bytes} bytes")
+            row_number += 1
+            yield row_number, None, f"CSV record longer than {max_record_bytes} bytes"
+            continue
+        record_text = "\n".join(record)
+        if not record_text.strip():
+            continue
+        values = next(csv.reader([record_text]))
+        if header is None:
+            header = [column.strip() for column in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, _unflatten(dict(zip(header, values))), None
+    if pending or oversized:
+        row_number += 1
+        yield row_number, None, "Unterminated quoted field"
+
+
+async def iter_chunks(rows: AsyncIterator[Row], chunk_size: int) -> AsyncIterator[List[Row]]:
+    """Groups rows into lists of at most `chunk_size`."""
+    chunk: List[Row] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
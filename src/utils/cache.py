@@ -0,0 +1,174 @@
+# src/utils/cache.py
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A small in-process cache combining least-recently-used eviction with a
+    per-entry time-to-live, optionally bounded by total entry weight
+    (e.g. approximate bytes) as well as entry count.
+
+    The cache is meant to be used from the event loop thread, so it does not
+    take any locks.
+
+    Attributes:
+        name (str): Name used when reporting statistics.
+        maxsize (int): Maximum number of entries kept before LRU eviction.
+        ttl (float): Default time-to-live of an entry, in seconds.
+        max_weight (Optional[int]): Upper bound on the summed weight of entries.
+        weigher (Optional[Callable]): Computes the weight of a value; required
+            together with `max_weight`.
+        copier (Optional[Callable]): Copies values on `set` and `get`, so callers
+            mutating a value they stored or read cannot corrupt the cached entry.
+            Leave unset for immutable values.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that were absent or expired.
+        evictions (int): Number of entries dropped to respect `maxsize`/`max_weight`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str = "cache",
+                 max_weight: Optional[int] = None,
+                 weigher: Optional[Callable[[Any], int]] = None,
+                 copier: Optional[Callable[[Any], Any]] = None):
+        if max_weight is not None and weigher is None:
+            raise ValueError("max_weight requires a weigher")
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.copier = copier
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value for `key`, or `default` if it is absent or expired.
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return self.copier(value) if self.copier else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Stores `value` under `key` for `ttl` seconds (the cache default if omitted).
+        """
+        if self.copier:
+            value = self.copier(value)
+        weight = self.weigher(value) if self.weigher else 0
+        if self.max_weight is not None and weight > self.max_weight:
+            return  # Never admit an entry that alone exceeds the budget
+        self._remove(key)
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value, weight)
+        self._weight += weight
+        while len(self._data) > self.maxsize or (
+                self.max_weight is not None and self._weight > self.max_weight):
+            _, (_, _, evicted_weight) = self._data.popitem(last=False)
+            self._weight -= evicted_weight
+            self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._weight -= entry[2]
+
+    def invalidate(self, key: Hashable):
+        """Removes `key` from the cache if present."""
+        self._remove(key)
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        self._data.clear()
+        self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> dict:
+        """Returns size and hit/miss counters for the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "weight": self._weight,
+            "max_weight": self.max_weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent loads of the same key: while a load for a key is
+    running, further callers wait for its result instead of starting their
+    own, so a burst of cache misses for one hot key costs a single query.
+
+    The load runs in its own task, so a caller that is cancelled does not
+    cancel the load for the others. Like TTLCache, it is meant to be used
+    from the event loop thread.
+
+    Attributes:
+        coalesced (int): Number of calls served by a load another caller started.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[Any]],
+                  store: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Returns the result of `load()`, sharing one execution among concurrent
+        callers with the same key.
+
+        Parameters:
+            key: Identifies the value being loaded.
+            load: Coroutine function performing the load.
+            store: Called with the result once the load succeeds, unless the key
+                was forgotten meanwhile (e.g. to fill a cache without racing
+                a concurrent invalidation).
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(load())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._finish(key, done, store))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: Hashable, flight: asyncio.Future, store: Optional[Callable[[Any], None]]):
+        succeeded = not flight.cancelled() and flight.exception() is None
+        if self._flights.get(key) is not flight:
+            return  # Forgotten while running: the result may predate a write
+        del self._flights[key]
+        if store is not None and succeeded:
+            store(flight.result())
+
+    def forget(self, key: Hashable):
+        """
+        Detaches a running load from `key`: later callers start a new load and
+        the detached one no longer reaches `store`.
+        """
+        self._flights.pop(key, None)
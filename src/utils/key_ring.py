@@ -0,0 +1,301 @@
+# src/utils/key_ring.py
+
+import asyncio
+import base64
+import hashlib
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+from cryptography.hazmat.primitives import serialization
+from jose import jwk
+from jose.backends.base import Key
+from src.configs.config import CurrentConfig
+from src.helpers.log_config import setup_logger
+
+logger = setup_logger()
+
+
+class KeyMaterial(NamedTuple):
+    """
+    Immutable snapshot of the active (signing) JWT key.
+
+    Attributes:
+        kid (str): Key id derived from the verification key.
+        algorithm (str): The JWT algorithm the keys are used with.
+        signing_key (Key): Parsed key used to sign tokens.
+        verification_key (Key): Parsed key used to verify token signatures.
+        private_key_pem (Optional[str]): PEM (or secret) form of the signing key.
+        public_key_pem (Optional[str]): PEM (or secret) form of the verification key.
+    """
+    kid: str
+    algorithm: str
+    signing_key: Key
+    verification_key: Key
+    private_key_pem: Optional[str]
+    public_key_pem: Optional[str]
+
+
+class KeySet(NamedTuple):
+    """
+    Immutable snapshot of every loaded key.
+
+    Attributes:
+        active (KeyMaterial): The key new tokens are signed with.
+        verification_keys (Dict[str, Key]): Every key tokens may be verified with, by kid.
+        legacy_kids (Dict[str, str]): Kids in the earlier format (see
+            `compute_legacy_kid`) mapped to the current kid of the same key.
+    """
+    active: KeyMaterial
+    verification_keys: Dict[str, Key]
+    legacy_kids: Dict[str, str] = {}
+
+
+def compute_kid(public_key_pem: str) -> str:
+    """
+    Derives a short, stable key id from the verification key (or HMAC secret).
+    Asymmetric keys are hashed in DER form, so the id does not depend on how
+    the PEM file is formatted.
+
+    Parameters:
+        public_key_pem (str): PEM-encoded public key, or the shared secret.
+
+    Returns:
+        str: URL-safe key id.
+    """
+    data = public_key_pem.strip().encode("utf-8")
+    if data.startswith(b"-----BEGIN"):
+        data = serialization.load_pem_public_key(data).public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    digest = hashlib.sha256(data).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode("ascii")
+
+
+def compute_legacy_kid(public_key_pem: str) -> str:
+    """
+    Key id in the format used before ids were derived from the DER form: a
+    hash of the PEM text as configured. Keys documents written back then
+    still carry such ids, so they are kept resolvable (`KeyRing.resolve_kid`).
+    """
+    digest = hashlib.sha256(public_key_pem.strip().encode("utf-8")).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode("ascii")
+
+
+def _public_pem(public_key) -> str:
+    return public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode("utf-8")
+
+
+class KeyRing:
+    """
+    Holds the parsed JWT keys so token operations only pay for the
+    cryptography, not for reading and parsing PEM files.
+
+    With KEYS_DIR set, every `*.pem` file in that directory is loaded: private
+    keys can sign and verify, public-only files (e.g. retired keys) can only
+    verify. Tokens carry the signing key's `kid` header and are verified with
+    the key of that id. The active signing key is ACTIVE_KID, or else the most
+    recently modified private key. Without KEYS_DIR the single configured key
+    pair (or HS256 secret) is used.
+
+    Keys are loaded once (normally in the application lifespan); `reload()`
+    swaps them atomically, and `watch()` does so whenever KEYS_DIR changes.
+    """
+
+    def __init__(self, config=CurrentConfig):
+        self._config = config
+        self._key_set: Optional[KeySet] = None
+        self._lock = threading.Lock()
+
+    def _load_configured_key(self) -> KeySet:
+        algorithm = self._config.ALGORITHM
+        if algorithm in ["RS256", "ES256"]:
+            private_key_pem = self._config.load_private_key()
+            public_key_pem = self._config.load_public_key()
+        elif algorithm == "HS256":
+            # HMAC uses the same shared secret for signing and verification
+            private_key_pem = public_key_pem = self._config.PRIVATE_KEY
+        else:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+        if not private_key_pem or not public_key_pem:
+            raise ValueError(f"JWT keys for {algorithm} are not configured")
+
+        active = KeyMaterial(
+            kid=compute_kid(public_key_pem),
+            algorithm=algorithm,
+            signing_key=jwk.construct(private_key_pem, algorithm),
+            verification_key=jwk.construct(public_key_pem, algorithm),
+            private_key_pem=private_key_pem,
+            public_key_pem=public_key_pem,
+        )
+        legacy_kid = compute_legacy_kid(public_key_pem)
+        return KeySet(active=active, verification_keys={active.kid: active.verification_key},
+                      legacy_kids={legacy_kid: active.kid} if legacy_kid != active.kid else {})
+
+    def _load_key_directory(self, keys_dir: str) -> KeySet:
+        algorithm = self._config.ALGORITHM
+        if algorithm not in ["RS256", "ES256"]:
+            raise ValueError(f"KEYS_DIR requires an asymmetric algorithm, got {algorithm}")
+
+        signing: Dict[str, Tuple[float, KeyMaterial]] = {}
+        verification_keys: Dict[str, Key] = {}
+        legacy_kids: Dict[str, str] = {}
+        for filename in sorted(os.listdir(keys_dir)):
+            if not filename.endswith(".pem"):
+                continue
+            path = os.path.join(keys_dir, filename)
+            with open(path, "rb") as key_file:
+                data = key_file.read()
+            try:
+                private_key = serialization.load_pem_private_key(data, password=None)
+                public_key = private_key.public_key()
+            except (ValueError, TypeError):
+                private_key = None
+                try:
+                    public_key = serialization.load_pem_public_key(data)
+                except ValueError:
+                    logger.warning(f"Skipping unreadable key file {path}")
+                    continue
+
+            public_key_pem = _public_pem(public_key)
+            kid = compute_kid(public_key_pem)
+            legacy_kids[compute_legacy_kid(public_key_pem)] = kid
+            if private_key is None:  # The file may hold the PEM text exactly as it used to be configured
+                legacy_kids[compute_legacy_kid(data.decode("utf-8", errors="replace"))] = kid
+            verification_key = jwk.construct(public_key, algorithm)
+            verification_keys[kid] = verification_key
+            if private_key is not None:
+                material = KeyMaterial(
+                    kid=kid,
+                    algorithm=algorithm,
+                    signing_key=jwk.construct(private_key, algorithm),
+                    verification_key=verification_key,
+                    private_key_pem=private_key.private_bytes(
+                        encoding=serialization.Encoding.PEM,
+                        format=serialization.PrivateFormat.PKCS8,
+                        encryption_algorithm=serialization.NoEncryption()
+                    ).decode("utf-8"),
+                    public_key_pem=public_key_pem,
+                )
+                signing[kid] = (os.path.getmtime(path), material)
+
+        if not signing:
+            raise ValueError(f"No private key found in {keys_dir}")
+        active_kid = self._config.ACTIVE_KID
+        if active_kid and active_kid in signing:
+            active = signing[active_kid][1]
+        else:
+            if active_kid:
+                logger.warning(f"ACTIVE_KID {active_kid} not found in {keys_dir}; using the newest key")
+            active = max(signing.values(), key=lambda entry: entry[0])[1]
+        return KeySet(active=active, verification_keys=verification_keys, legacy_kids=legacy_kids)
+
+    def _load_key_set(self) -> KeySet:
+        keys_dir = self._config.KEYS_DIR
+        if keys_dir:
+            return self._load_key_directory(keys_dir)
+        return self._load_configured_key()
+
+    def load(self) -> KeyMaterial:
+        """
+        Loads the keys if they have not been loaded yet.
+
+        Returns:
+            KeyMaterial: The active key snapshot.
+        """
+        if self._key_set is None:
+            with self._lock:
+                if self._key_set is None:
+                    self._key_set = self._load_key_set()
+                    self._log_loaded("Loaded")
+        return self._key_set.active
+
+    def reload(self) -> KeyMaterial:
+        """
+        Re-reads and re-parses the keys, then swaps them in atomically.
+        In-flight operations keep using the snapshot they already hold.
+
+        Returns:
+            KeyMaterial: The new active key snapshot.
+        """
+        key_set = self._load_key_set()
+        with self._lock:
+            self._key_set = key_set
+        self._log_loaded("Reloaded")
+        return key_set.active
+
+    def _log_loaded(self, action: str):
+        key_set = self._key_set
+        logger.info(f"{action} JWT keys for {key_set.active.algorithm}: active kid {key_set.active.kid}, "
+                    f"{len(key_set.verification_keys)} verification key(s)")
+
+    @property
+    def material(self) -> KeyMaterial:
+        """The active key snapshot, loading it lazily if needed."""
+        if self._key_set is None:
+            return self.load()
+        return self._key_set.active
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Key]:
+        """
+        Looks up the key a token must be verified with.
+
+        Parameters:
+            kid (Optional[str]): The token's `kid` header. Tokens without one
+                were issued before key ids and are checked against the active key.
+
+        Returns:
+            Optional[Key]: The verification key, or None if the kid is unknown.
+        """
+        if self._key_set is None:
+            self.load()
+        if kid is None:
+            return self._key_set.active.verification_key
+        return self._key_set.verification_keys.get(self.resolve_kid(kid))
+
+    def resolve_kid(self, kid: str) -> str:
+        """
+        Maps a kid in the earlier (PEM-text hash) format to the current id of
+        the same key; current kids and unknown ids are returned unchanged.
+        """
+        if self._key_set is None:
+            self.load()
+        return self._key_set.legacy_kids.get(kid, kid)
+
+    def _directory_signature(self) -> tuple:
+        keys_dir = self._config.KEYS_DIR
+        entries = []
+        for filename in sorted(os.listdir(keys_dir)):
+            if filename.endswith(".pem"):
+                stat = os.stat(os.path.join(keys_dir, filename))
+                entries.append((filename, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    async def watch(self, interval: float = CurrentConfig.KEY_RELOAD_INTERVAL_SECONDS):
+        """
+        Reloads the keys whenever a `.pem` file in KEYS_DIR is added, removed
+        or modified, so keys can be rotated without restarting workers. A
+        broken key directory is logged and the previous keys stay in use.
+
+        Parameters:
+            interval (float): Seconds between directory checks.
+        """
+        if not self._config.KEYS_DIR:
+            return
+        signature = self._directory_signature()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                current = self._directory_signature()
+                if current != signature:
+                    await asyncio.to_thread(self.reload)
+                    signature = current
+            except Exception as e:
+                logger.error(f"Failed to reload JWT keys from {self._config.KEYS_DIR}: {e}")
+
+
+key_ring = KeyRing()
@@ -0,0 +1,90 @@
+# src/utils/pagination.py
+
+import base64
+import json
+from typing import Any, List, NamedTuple, Optional, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING
+from src.core.error_response_handler import ErrorResponseHandler
+
+
+class KeysetSort(NamedTuple):
+    """
+    A sort order usable for keyset pagination: a field plus `_id` as tie-breaker.
+
+    Attributes:
+        name (str): Public name of the sort, embedded in cursors.
+        field (Optional[str]): The numeric sort field, or None to sort by `_id` alone.
+        direction (int): pymongo.ASCENDING or pymongo.DESCENDING.
+    """
+    name: str
+    field: Optional[str]
+    direction: int
+
+    def mongo_sort(self) -> List[Tuple[str, int]]:
+        """The `sort` specification matching this order."""
+        if self.field is None:
+            return [("_id", self.direction)]
+        return [(self.field, self.direction), ("_id", self.direction)]
+
+    def after(self, value: Any, last_id: ObjectId) -> dict:
+        """
+        Query selecting the documents that follow (value, last_id) in this order.
+        With a matching index this is a range scan starting right after the
+        previous page, so every page costs the same regardless of depth.
+        """
+        op = "$gt" if self.direction == ASCENDING else "$lt"
+        if self.field is None:
+            return {"_id": {op: last_id}}
+        return {"$or": [{self.field: {op: value}},
+                        {self.field: value, "_id": {op: last_id}}]}
+
+
+def encode_cursor(sort: KeysetSort, document: dict) -> str:
+    """
+    Builds the opaque cursor pointing just after `document`.
+
+    Parameters:
+        sort (KeysetSort): The sort the page was read with.
+        document (dict): The last document of the page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    value = document.get(sort.field) if sort.field else None
+    raw = json.dumps([sort.name, value, str(document["_id"])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(sort: KeysetSort, cursor: str) -> dict:
+    """
+    Turns a cursor from `encode_cursor` back into the query for the next page.
+
+    Parameters:
+        sort (KeysetSort): The sort of the current request.
+        cursor (str): The cursor received from the client.
+
+    Returns:
+        dict: The keyset query selecting the documents after the cursor.
+
+    Raises:
+        HTTPException (400): If the cursor is malformed, carries a non-numeric sort
+            value, or was issued for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = ObjectId(last_id)
+    except Exception:
+        ErrorResponseHandler.bad_request("Invalid pagination cursor")
+    if name != sort.name:
+        ErrorResponseHandler.bad_request("Pagination cursor does not match the requested sort order")
+    # The value is placed in the query verbatim, so anything but a plain number
+    # (e.g. {"$exists": true}) would inject an operator
+    if sort.field is None:
+        valid = value is None
+    else:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if not valid:
+        ErrorResponseHandler.bad_request("Invalid pagination cursor")
+    return sort.after(value, last_id)
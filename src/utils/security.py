@@ -2,12 +2,22 @@
 
 import os
 import re
+import sys
+import time
+import hashlib
+import asyncio
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from dotenv import load_dotenv
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from src.configs.config import CurrentConfig
+from src.core.error_response_handler import ErrorResponseHandler
+from src.utils.key_ring import key_ring
+from src.utils.cache import TTLCache
+from src.helpers import metrics
 
 # Load environment variables from .env file
 load_dotenv()
@@ -36,9 +46,120 @@ def is_password_complex(password: str) -> bool:
     return bool(PASSWORD_PATTERN.match(password))
 
 
+def _hash_in_worker(password: str, submitted_at: float):
+    """Worker-side bcrypt hash; returns the hash and when work actually started."""
+    started_at = time.monotonic()
+    return pwd_context.hash(password), started_at - submitted_at
+
+
+def _verify_in_worker(plain_password: str, hashed_password: str, submitted_at: float):
+    """Worker-side bcrypt verify; returns the result and when work actually started."""
+    started_at = time.monotonic()
+    return pwd_context.verify(plain_password, hashed_password), started_at - submitted_at
+
+
+class PasswordHashingPool:
+    """
+    Runs bcrypt hashing and verification on a bounded worker pool so the
+    event loop is never blocked for the full bcrypt cost.
+
+    Attributes:
+        executor_type (str): "thread" or "process".
+        max_workers (int): Number of workers in the pool.
+        max_pending (int): Maximum number of queued plus running jobs before
+            new work is rejected with a 503.
+    """
+
+    def __init__(self, executor_type: str, max_workers: int, max_pending: int):
+        self.executor_type = executor_type
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        # Metrics, updated from the event loop thread only
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, operation: str, func, *args):
+        """
+        Submits a password job to the pool and awaits its result.
+
+        Parameters:
+        - operation (str): Name of the job ("hash" or "verify"), used for metrics.
+        - func: Picklable worker function returning (result, seconds waited).
+
+        Raises:
+        - HTTPException (503): If the queue depth limit has been reached.
+        """
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            ErrorResponseHandler.service_unavailable(
+                "Too many concurrent authentication requests, please retry shortly")
+
+        self._pending += 1
+        submitted_at = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited = await loop.run_in_executor(
+                self._get_executor(), func, *args, submitted_at)
+        finally:
+            self._pending -= 1
+
+        metrics.PASSWORD_HASH_SECONDS.observe(time.monotonic() - submitted_at, operation)
+        metrics.PASSWORD_HASH_WAIT_SECONDS.observe(waited, operation)
+
+        self.completed += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return result
+
+    def get_stats(self) -> dict:
+        """Returns queue depth and wait-time metrics for the pool."""
+        return {
+            "executor": self.executor_type,
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": (self.total_wait_seconds / self.completed) if self.completed else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shuts down the underlying executor, if it was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_hashing_pool = PasswordHashingPool(
+    executor_type=CurrentConfig.PASSWORD_HASH_EXECUTOR,
+    max_workers=CurrentConfig.PASSWORD_HASH_WORKERS,
+    max_pending=CurrentConfig.PASSWORD_HASH_MAX_PENDING,
+)
+metrics.registry.register(metrics.CallbackMetric(
+    "password_hash_pending", "bcrypt jobs queued or running on the worker pool.",
+    lambda: password_hashing_pool.get_stats()["pending"]))
+metrics.registry.register(metrics.CallbackMetric(
+    "password_hash_rejected_total", "bcrypt jobs rejected because the queue was full.",
+    lambda: password_hashing_pool.rejected, kind="counter"))
+
+
 async def hash_password(password: str) -> str:
     """
-    Asynchronously hashes a password using bcrypt.
+    Asynchronously hashes a password using bcrypt on the password hashing pool.
     
     Parameters:
     - password (str): The password to hash.
@@ -46,12 +167,13 @@ async def hash_password(password: str) -> str:
     Returns:
     - str: The hashed password.
     """
-    return pwd_context.hash(password)
+    return await password_hashing_pool.run("hash", _hash_in_worker, password)
 
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Asynchronously verifies a plain password against its hashed version.
+    Asynchronously verifies a plain password against its hashed version
+    on the password hashing pool.
     
     Parameters:
     - plain_password (str): The plain text password to verify.
@@ -60,40 +182,28 @@ async def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
     - bool: True if the verification is successful, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hashing_pool.run("verify", _verify_in_worker, plain_password, hashed_password)
 
 
 def get_jwt_secret_key() -> str:
     """
-    Retrieves the appropriate secret key for JWT operations based on
-    the configured algorithm. Adjusted to ensure RSA keys are returned
-    in PEM format as a string.
+    Retrieves the secret key (HS256) or PEM-encoded private key (RS256/ES256)
+    for JWT operations from the already-loaded key ring.
     
     Returns:
     - str: The secret key or private key for JWT encoding.
     """
-    if CurrentConfig.ALGORITHM in ["RS256", "ES256"]:
-        # Assuming you adjust CurrentConfig.load_private_key() to return
-        # the PEM-encoded string directly
-        return CurrentConfig.load_private_key()
-    else:
-        return CurrentConfig.PRIVATE_KEY
+    return key_ring.material.private_key_pem
 
 def get_jwt_public_key() -> str:
     """
-    Retrieves the appropriate secret key for JWT operations based on
-    the configured algorithm. Adjusted to ensure RSA keys are returned
-    in PEM format as a string.
+    Retrieves the secret key (HS256) or PEM-encoded public key (RS256/ES256)
+    for JWT operations from the already-loaded key ring.
     
     Returns:
-    - str: The secret key or public key for JWT encoding.
+    - str: The secret key or public key for JWT decoding.
     """
-    if CurrentConfig.ALGORITHM in ["RS256", "ES256"]:
-        # Assuming you adjust CurrentConfig.load_public_key() to return
-        # the PEM-encoded string directly
-        return CurrentConfig.load_public_key()
-    else:
-        return CurrentConfig.PUBLIC_KEY
+    return key_ring.material.public_key_pem
 
 def create_token(data: dict, 
                  expires_delta: Optional[timedelta] = None,
@@ -106,6 +216,9 @@ def create_token(data: dict,
     - expires_delta (Optional[timedelta]): Optional expiration delta from now.
     - is_refresh_token (bool): Indicates if the token is a refresh token.
     
+    Refresh tokens also carry a random `jti`, so every issued refresh token
+    is distinct.
+
     Returns:
     - str: The encoded JWT token.
     """
@@ -122,15 +235,26 @@ def create_token(data: dict,
         "exp": expire,
         "type": token_type  # Add token type to the payload
     })
+    if is_refresh_token:
+        # Unique per token: refreshing twice within one `exp` second must still
+        # yield a new fingerprint, or rotation would mistake it for a replay
+        to_encode["jti"] = uuid.uuid4().hex
     
-    return jwt.encode(to_encode, get_jwt_secret_key(),
-                      algorithm=CurrentConfig.ALGORITHM)
+    material = key_ring.material
+    started_at = time.perf_counter()
+    token = jwt.encode(to_encode, material.signing_key,
+                       algorithm=material.algorithm,
+                       headers={"kid": material.kid})
+    metrics.JWT_OPERATION_SECONDS.observe(time.perf_counter() - started_at, "sign")
+    return token
 
 
 async def decode_token(token: str) -> dict:
     """
     Decodes a JWT token (either access or refresh) and validates its integrity,
-    supporting RS256, ES256, and HS256 algorithms.
+    supporting RS256, ES256, and HS256 algorithms. The token's `kid` header
+    selects the verification key, so tokens signed with a previous key stay
+    valid while that key is still in the key ring.
 
     Parameters:
     - token (str): The JWT token to decode and validate.
@@ -142,18 +266,85 @@ async def decode_token(token: str) -> dict:
     - JWTError: If the token is invalid or expired.
     """
     try:
-        # Determine the appropriate key based on the algorithm
-        if CurrentConfig.ALGORITHM in ["RS256", "ES256"]:
-            key = get_jwt_public_key()  # Use the public key for RSA and ECDSA
-        elif CurrentConfig.ALGORITHM == "HS256":
-            key = get_jwt_secret_key()  # Use the secret key for HMAC
-        else:
-            raise ValueError(f"Unsupported JWT algorithm: {CurrentConfig.ALGORITHM}")
-
-        # Decode the token with the selected key
-        payload = jwt.decode(token, key, algorithms=[CurrentConfig.ALGORITHM])
+        # The key ring already holds the parsed keys for the configured algorithm
+        kid = jwt.get_unverified_header(token).get("kid")
+        verification_key = key_ring.verification_key(kid)
+        if verification_key is None:
+            raise JWTError(f"Unknown signing key id: {kid}")
+        started_at = time.perf_counter()
+        payload = jwt.decode(token, verification_key, algorithms=[key_ring.material.algorithm])
+        metrics.JWT_OPERATION_SECONDS.observe(time.perf_counter() - started_at, "verify")
         return payload
     except JWTError as e:
         raise JWTError(f"Invalid or expired token: {e}")
     except ValueError as e:
-        raise ValueError(str(e))
\ No newline at end of file
+        raise ValueError(str(e))
+
+
+def token_fingerprint(token: str) -> bytes:
+    """
+    Computes the fixed-size digest stored in place of a full refresh token.
+
+    Parameters:
+    - token (str): The JWT token.
+
+    Returns:
+    - bytes: The first 16 bytes of the token's SHA-256 digest.
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()[:16]
+
+
+def _verified_token_weight(entry: tuple) -> int:
+    """Approximates the memory held by a cached (key material, payload) entry."""
+    _, payload = entry
+    return sys.getsizeof(payload) + sum(
+        sys.getsizeof(k) + sys.getsizeof(v) for k, v in payload.items())
+
+
+def _copy_verified_token(entry: tuple) -> tuple:
+    """Copies the payload of a cached entry; the key material is shared and immutable."""
+    material, payload = entry
+    return material, dict(payload)
+
+
+# Payloads of tokens whose signature has already been verified, keyed by a
+# digest of the token string and kept until the token's own `exp`.
+verified_token_cache = TTLCache(maxsize=CurrentConfig.TOKEN_CACHE_MAX_SIZE,
+                                ttl=CurrentConfig.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+                                name="verified_tokens",
+                                max_weight=CurrentConfig.TOKEN_CACHE_MAX_BYTES,
+                                weigher=_verified_token_weight,
+                                copier=_copy_verified_token)
+metrics.register_cache(verified_token_cache)
+
+
+async def decode_token_cached(token: str) -> dict:
+    """
+    Decodes a JWT token like `decode_token`, but skips the signature check for
+    tokens that were already verified and have not yet expired.
+
+    Entries are tied to the key material that was active when they were
+    verified, so a key reload (e.g. a retired key being removed) invalidates them.
+
+    Parameters:
+    - token (str): The JWT token to decode and validate.
+
+    Returns:
+    - dict: The payload of the decoded JWT token if valid.
+
+    Raises:
+    - JWTError: If the token is invalid or expired.
+    """
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    material = key_ring.material
+    entry = verified_token_cache.get(cache_key)
+    if entry is not None and entry[0] is material:
+        return entry[1]
+
+    payload = await decode_token(token)
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            verified_token_cache.set(cache_key, (material, payload), ttl=remaining)
+    return payload